@@ -130,6 +130,63 @@ from decouple import config
 # Google API Configuration
 GOOGLE_API_KEY = config('GOOGLE_API_KEY', default='')
 
+# Extra or replacement roadmap generator backends (name -> dotted class path),
+# merged over the built-in 'gemini', 'template' and 'fake' backends from
+# services/backends.py. Loaded lazily on first use; each class must
+# implement generate_roadmap() and suggest_resources().
+ROADMAP_BACKENDS = {}
+
+# Roadmap generation policy: steps are tried in order. Hedged steps fire a
+# second request once the first exceeds the observed HEDGE_PERCENTILE latency
+# (or `hedge_after` seconds until MIN_SAMPLES calls have been observed).
+# `prompt_version` picks the Gemini prompt template (see services/prompt_builder.py;
+# compare versions with `manage.py bench_prompts`).
+ROADMAP_GENERATION = {
+    'HEDGE_PERCENTILE': 95,
+    'MIN_SAMPLES': 20,
+    'MAX_WORKERS': 8,
+    'CHAIN': [
+        {'name': 'gemini-flash', 'backend': 'gemini',
+         'options': {'model_name': 'gemini-1.5-flash', 'prompt_version': 'v2'},
+         'deadline': 30, 'hedge': True, 'hedge_after': 10},
+        {'name': 'gemini-flash-8b', 'backend': 'gemini',
+         'options': {'model_name': 'gemini-1.5-flash-8b', 'prompt_version': 'v2'},
+         'deadline': 20, 'hedge': True, 'hedge_after': 8},
+        {'name': 'template', 'backend': 'template'},
+    ],
+}
+
+# Resource link health checks. URLs checked within MAX_AGE_HOURS are skipped;
+# run `manage.py check_links` on a schedule to refresh the rest.
+LINK_CHECKER = {
+    'CONCURRENCY': 100,
+    'PER_HOST': 8,
+    'TIMEOUT': 10,
+    'MAX_AGE_HOURS': 24,
+    'BATCH_SIZE': 5000,
+    'CHECK_ON_CREATE': True,
+}
+
+# Deleted goals are tombstoned immediately and their roadmap rows purged
+# in background batches; `manage.py purge_deleted_goals` catches leftovers.
+GOAL_PURGE = {
+    'BATCH_SIZE': 1000,
+    'THROTTLE_SECONDS': 0.05,
+    'GOALS_PER_PASS': 50,
+    'PURGE_ON_DELETE': True,
+}
+
+# Category/difficulty stats are kept incrementally in aggregate tables;
+# run `manage.py rebuild_analytics` nightly to verify and repair them.
+ANALYTICS = {
+    'CACHE_SECONDS': 300,
+    'TOP_RESOURCES': 5,
+}
+
+# Roadmaps with more weeks than this render only the current and next week
+# up front and fetch the others as the user scrolls (append ?all=1 to opt out).
+ROADMAP_DETAIL_PAGED_MIN_WEEKS = 8
+
 # Login settings
 LOGIN_URL = 'login'
 LOGIN_REDIRECT_URL = 'dashboard'
@@ -1,33 +1,187 @@
 from django.contrib import admin
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from .models import Category, LearningGoal, Roadmap, Milestone, Resource, Progress, LinkStatus
+from .paginators import ApproximateCountPaginator
+from .services.analytics_service import add_goals, remove_goals
+from .services.purge_service import schedule_purge, soft_delete_goals
+from .services.roadmap_service import schedule_regeneration
+from .services.search_service import index_goals
+
+
+ACTION_BATCH_SIZE = 1000
+
+
+def _batched_update(queryset, **values):
+    """Apply an UPDATE to the selected rows in primary-key batches, keeping each write short"""
+    pks = list(queryset.order_by().values_list('pk', flat=True))
+    for start in range(0, len(pks), ACTION_BATCH_SIZE):
+        queryset.model.objects.filter(pk__in=pks[start:start + ACTION_BATCH_SIZE]).update(**values)
+    return len(pks)
+
+
+class CompletionActionsMixin:
+    """Mark selected milestones/resources complete or incomplete without loading them"""
+
+    actions = ['mark_completed', 'mark_incomplete']
+    goal_lookup = None
+
+    def _update_completion(self, queryset, **values):
+        # Recount the affected goals' analytics around the bulk UPDATE
+        goal_ids = list(queryset.order_by().values_list(self.goal_lookup, flat=True).distinct())
+        with transaction.atomic():
+            remove_goals(goal_ids)
+            updated = _batched_update(queryset, **values)
+            add_goals(goal_ids)
+        return updated
+
+    @admin.action(description='Mark selected as completed')
+    def mark_completed(self, request, queryset):
+        updated = self._update_completion(queryset.filter(is_completed=False), is_completed=True, completed_at=timezone.now())
+        self.message_user(request, f'Marked {updated} as completed.')
+
+    @admin.action(description='Mark selected as not completed')
+    def mark_incomplete(self, request, queryset):
+        updated = self._update_completion(queryset.filter(is_completed=True), is_completed=False, completed_at=None)
+        self.message_user(request, f'Marked {updated} as not completed.')
 
-from .models import Category, LearningGoal, Roadmap, Milestone, Resource, Progress
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
     list_display = ['name', 'category_type']
     list_filter = ['category_type']
+    search_fields = ['name']
 
 @admin.register(LearningGoal)
 class LearningGoalAdmin(admin.ModelAdmin):
-    list_display = ['title', 'user', 'category', 'difficulty_level', 'created_at']
-    list_filter = ['category', 'difficulty_level', 'is_active']
+    list_display = ['title', 'user', 'category', 'difficulty_level', 'created_at', 'deleted_at']
+    list_filter = ['category', 'difficulty_level', 'is_active', ('deleted_at', admin.EmptyFieldListFilter)]
+    list_select_related = ['user', 'category']
     search_fields = ['title', 'user__username']
+    autocomplete_fields = ['user', 'category']
+    show_full_result_count = False
+    actions = ['regenerate_roadmaps']
+
+    # Rows the purge removes along with a goal, as the collector would find them
+    purged_relations = [
+        (Roadmap, 'goal__in'),
+        (Milestone, 'roadmap__goal__in'),
+        (Resource, 'milestone__roadmap__goal__in'),
+        (Progress, 'milestone__roadmap__goal__in'),
+    ]
+
+    # Deleting a goal only sets its tombstone; purge_service removes the
+    # roadmap rows in batches afterwards, so skip the collector entirely.
+    # The delete permissions it would have checked are still required.
+    def get_deleted_objects(self, objs, request):
+        perms_needed = set()
+        for model, lookup in self.purged_relations:
+            model_admin = self.admin_site._registry.get(model)
+            if (model_admin and not model_admin.has_delete_permission(request)
+                    and model.objects.filter(**{lookup: objs}).exists()):
+                perms_needed.add(model._meta.verbose_name)
+        return [str(obj) for obj in objs], {'learning goals': len(objs)}, perms_needed, []
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        # Milestone and resource documents carry the owner they were indexed
+        # with; re-index them so the new owner can find them
+        if change and 'user' in form.changed_data:
+            index_goals([obj.pk])
+
+    def delete_model(self, request, obj):
+        obj.soft_delete()
+        schedule_purge()
+
+    def delete_queryset(self, request, queryset):
+        soft_delete_goals(queryset)
+        schedule_purge()
+
+    @admin.action(description='Regenerate roadmaps for selected goals (background)')
+    def regenerate_roadmaps(self, request, queryset):
+        goal_ids = list(queryset.filter(deleted_at__isnull=True).values_list('id', flat=True))
+        schedule_regeneration(goal_ids)
+        self.message_user(request, f'Regenerating {len(goal_ids)} roadmaps in the background.')
 
 @admin.register(Roadmap)
 class RoadmapAdmin(admin.ModelAdmin):
     list_display = ['goal', 'generated_at']
+    # goal.__str__ reads goal.user.username
+    list_select_related = ['goal__user']
+    search_fields = ['goal__title']
+    autocomplete_fields = ['goal']
+    show_full_result_count = False
 
 @admin.register(Milestone)
-class MilestoneAdmin(admin.ModelAdmin):
+class MilestoneAdmin(CompletionActionsMixin, admin.ModelAdmin):
     list_display = ['title', 'week_number', 'is_completed']
     list_filter = ['is_completed', 'week_number']
+    search_fields = ['title']
+    autocomplete_fields = ['roadmap']
+    goal_lookup = 'roadmap__goal_id'
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
+
+class LinkHealthFilter(admin.SimpleListFilter):
+    title = 'link health'
+    parameter_name = 'link_health'
+
+    def lookups(self, request, model_admin):
+        return [('flagged', 'Flagged'), ('ok', 'OK'), ('unchecked', 'Not checked yet')]
+
+    def queryset(self, request, queryset):
+        if self.value() == 'flagged':
+            return queryset.filter(link_state__in=['broken', 'error'])
+        if self.value() == 'ok':
+            return queryset.filter(link_state='ok')
+        if self.value() == 'unchecked':
+            return queryset.filter(link_state__isnull=True)
+        return queryset
+
 
 @admin.register(Resource)
-class ResourceAdmin(admin.ModelAdmin):
-    list_display = ['title', 'resource_type', 'is_free', 'is_completed']
-    list_filter = ['resource_type', 'is_free', 'is_completed']
+class ResourceAdmin(CompletionActionsMixin, admin.ModelAdmin):
+    list_display = ['title', 'resource_type', 'is_free', 'is_completed', 'link_health']
+    list_filter = ['resource_type', 'is_free', 'is_completed', LinkHealthFilter]
+    search_fields = ['title']
+    autocomplete_fields = ['milestone']
+    goal_lookup = 'milestone__roadmap__goal_id'
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        # Annotate instead of a per-row lookup to keep the changelist at one query
+        link_state = LinkStatus.objects.filter(url=OuterRef('url')).values('status')[:1]
+        return super().get_queryset(request).annotate(link_state=Subquery(link_state))
+
+    @admin.display(description='Link', ordering='link_state')
+    def link_health(self, obj):
+        return obj.link_state or 'unchecked'
+
+
+@admin.register(LinkStatus)
+class LinkStatusAdmin(admin.ModelAdmin):
+    list_display = ['url', 'status', 'http_status', 'response_ms', 'last_checked_at']
+    list_filter = ['status']
+    search_fields = ['url']
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
+    actions = ['recheck_links']
+
+    @admin.action(description='Re-check selected links')
+    def recheck_links(self, request, queryset):
+        from .services.link_checker import schedule_link_recheck
+
+        queued = schedule_link_recheck(queryset.values_list('url', flat=True))
+        self.message_user(request, f'Re-checking {queued} links in the background; refresh to see results.')
 
 @admin.register(Progress)
 class ProgressAdmin(admin.ModelAdmin):
     list_display = ['user', 'milestone', 'hours_spent', 'updated_at']
+    list_select_related = ['user', 'milestone']
+    autocomplete_fields = ['user', 'milestone']
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
 # Register your models here.
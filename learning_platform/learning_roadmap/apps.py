@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class LearningRoadmapConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'learning_roadmap'
+
+    def ready(self):
+        from . import signals  # noqa: F401
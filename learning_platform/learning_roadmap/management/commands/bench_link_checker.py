@@ -0,0 +1,141 @@
+# learning_roadmap/management/commands/bench_link_checker.py
+
+import asyncio
+import threading
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+
+from learning_roadmap.services.link_checker import LinkChecker
+
+
+class StandInServer:
+    """
+    Local HTTP server standing in for the sites resources link to.
+
+    Listens on several loopback addresses so per-host limits behave as they
+    would against many real hosts. Paths decide the response:
+    /ok/<n> -> 200, /missing/<n> -> 404, /nohead/<n> -> 405 on HEAD, 200 on GET,
+    /slow/<n> -> 200 after a delay, /drophead/<n> -> connection dropped on
+    HEAD, 200 on GET.
+    """
+
+    START_TIMEOUT = 10
+
+    def __init__(self, hosts: int = 8, slow_delay: float = 0.05):
+        self.addresses = [f'127.0.0.{i}' for i in range(1, hosts + 1)]
+        self.slow_delay = slow_delay
+        self.port = None
+        self._loop = None
+        self._runner = None
+        self._ready = threading.Event()
+        self._error = None
+
+    def __enter__(self):
+        threading.Thread(target=self._serve, name='stand-in-http', daemon=True).start()
+        if not self._ready.wait(self.START_TIMEOUT):
+            raise RuntimeError(f"Stand-in server did not start within {self.START_TIMEOUT}s")
+        if self._error is not None:
+            # e.g. binding 127.0.0.2+ fails where only 127.0.0.1 is configured (macOS)
+            raise RuntimeError(f"Stand-in server failed to start: {self._error}") from self._error
+        return self
+
+    def __exit__(self, *exc):
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+    def _serve(self):
+        from aiohttp import web
+
+        async def ok(request):
+            return web.Response(text='ok')
+
+        async def missing(request):
+            return web.Response(status=404)
+
+        async def nohead(request):
+            if request.method == 'HEAD':
+                return web.Response(status=405)
+            return web.Response(text='ok')
+
+        async def drophead(request):
+            if request.method == 'HEAD':
+                request.transport.close()
+            return web.Response(text='ok')
+
+        async def slow(request):
+            await asyncio.sleep(self.slow_delay)
+            return web.Response(text='ok')
+
+        async def start():
+            app = web.Application()
+            app.router.add_route('GET', '/ok/{n}', ok)
+            app.router.add_route('GET', '/missing/{n}', missing)
+            app.router.add_route('*', '/nohead/{n}', nohead)
+            app.router.add_route('GET', '/slow/{n}', slow)
+            app.router.add_route('*', '/drophead/{n}', drophead)
+            self._runner = web.AppRunner(app, access_log=None)
+            await self._runner.setup()
+            await web.TCPSite(self._runner, self.addresses[0], 0).start()
+            self.port = self._runner.addresses[0][1]
+            for address in self.addresses[1:]:
+                await web.TCPSite(self._runner, address, self.port).start()
+
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(start())
+        except Exception as e:
+            self._error = e
+            if self._runner is not None:
+                self._loop.run_until_complete(self._runner.cleanup())
+            self._loop.close()
+            return
+        finally:
+            self._ready.set()
+        self._loop.run_forever()
+
+    def urls(self, count: int):
+        # 80% healthy, 10% dead, 5% HEAD-hostile, 5% slow
+        kinds = ['ok'] * 16 + ['missing'] * 2 + ['nohead', 'slow']
+        for n in range(count):
+            host = self.addresses[n % len(self.addresses)]
+            yield f'http://{host}:{self.port}/{kinds[n % len(kinds)]}/{n}'
+
+
+class Command(BaseCommand):
+    help = "Benchmark the link checker against a local stand-in HTTP server."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--urls', type=int, default=100000)
+        parser.add_argument('--hosts', type=int, default=8)
+        parser.add_argument('--concurrency', type=int, default=100)
+        parser.add_argument('--per-host', type=int, default=16)
+
+    def handle(self, *args, **options):
+        checker = LinkChecker(concurrency=options['concurrency'], per_host=options['per_host'], timeout=10)
+
+        with StandInServer(hosts=options['hosts']) as server:
+            urls = list(server.urls(options['urls']))
+            started = time.perf_counter()
+            results = checker.check(urls)
+            elapsed = time.perf_counter() - started
+
+        statuses = Counter(result.status for result in results)
+        latencies = sorted(result.response_ms for result in results)
+        p50 = latencies[len(latencies) // 2]
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+
+        self.stdout.write(f"Checked {len(urls)} URLs across {options['hosts']} hosts in {elapsed:.1f}s")
+        self.stdout.write(f"  throughput: {len(urls) / elapsed:,.0f} URLs/s")
+        self.stdout.write(f"  latency:    p50 {p50} ms, p99 {p99} ms")
+        self.stdout.write(f"  results:    {dict(statuses)}")
+
+        expected_broken = sum(1 for url in urls if '/missing/' in url)
+        if statuses['broken'] != expected_broken or statuses['error']:
+            raise CommandError(
+                f"Unexpected results from stand-in server: expected {expected_broken} broken and no errors, "
+                f"got {dict(statuses)}"
+            )
+        self.stdout.write(self.style.SUCCESS('All URLs classified correctly'))
@@ -0,0 +1,119 @@
+# learning_roadmap/management/commands/bench_prompts.py
+
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from learning_roadmap.services.prompt_builder import CATEGORY_TYPES, PROMPT_TEMPLATES, estimate_tokens
+from learning_roadmap.services.template_service import TemplateRoadmapGenerator
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare prompt template versions by roadmap length: prompt and output tokens, output budget, "
+        "local build/parse time and generation latency. Offline by default, using template roadmaps "
+        "as stand-in answers and ~4 characters per token; --live calls Gemini and reports its usage "
+        "metadata and wall-clock latency instead."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--weeks', type=int, nargs='+', default=[2, 4, 8, 12, 26, 52])
+        parser.add_argument('--versions', nargs='+', default=sorted(PROMPT_TEMPLATES))
+        parser.add_argument('--category-type', default='coding', choices=CATEGORY_TYPES)
+        parser.add_argument('--difficulty', default='beginner')
+        parser.add_argument('--repeat', type=int, default=200, help='Iterations for the local timings')
+        parser.add_argument('--decode-rate', type=float, default=200,
+                            help='Output tokens per second assumed for the offline latency estimate')
+        parser.add_argument('--live', action='store_true', help='Call Gemini (needs GOOGLE_API_KEY)')
+        parser.add_argument('--model', default='gemini-1.5-flash')
+
+    def handle(self, *args, **options):
+        unknown = set(options['versions']) - set(PROMPT_TEMPLATES)
+        if unknown:
+            raise CommandError(f"Unknown prompt versions: {', '.join(sorted(unknown))}")
+
+        if options['live']:
+            self.stdout.write(
+                f"{'version':<9}{'weeks':>6}{'prompt tok':>12}{'cached tok':>12}{'output tok':>12}"
+                f"{'budget':>8}{'latency s':>11}{'milestones':>12}"
+            )
+        else:
+            self.stdout.write(
+                f"{'version':<9}{'weeks':>6}{'prefix tok':>12}{'request tok':>13}{'output tok':>12}"
+                f"{'budget':>8}{'build us':>10}{'parse us':>10}{'est. s':>8}"
+            )
+
+        for version in options['versions']:
+            template = PROMPT_TEMPLATES[version]
+            generator = self._live_generator(version, options) if options['live'] else None
+            for weeks in options['weeks']:
+                goal_data = self._goal(weeks, options)
+                prompt = template.build(goal_data)
+                budget = (prompt.generation_config or {}).get('max_output_tokens')
+                if generator is not None:
+                    self._run_live(generator, prompt, weeks, budget)
+                else:
+                    self._run_offline(template, goal_data, prompt, weeks, budget, options)
+
+    def _goal(self, weeks, options):
+        return {
+            'title': 'Learn React and build a portfolio site',
+            'description': 'I know basic HTML, CSS and JavaScript and want to build interactive front ends.',
+            'category': 'Web development',
+            'category_type': options['category_type'],
+            'difficulty_level': options['difficulty'],
+            'hours_per_week': 6,
+            'target_duration_weeks': weeks,
+        }
+
+    def _run_offline(self, template, goal_data, prompt, weeks, budget, options):
+        # Stand-in answer: a template roadmap with as many resources as this version asks for
+        stand_in = TemplateRoadmapGenerator()
+        roadmap = stand_in.generate_roadmap(goal_data)
+        resources = template.resources_per_milestone(weeks)
+        for milestone in roadmap['milestones']:
+            milestone['resources'] = stand_in.suggest_resources(milestone['title'], goal_data['difficulty_level'],
+                                                                resources)
+        answer = template.render(roadmap, weeks)
+
+        build_us = self._time(lambda: template.build(goal_data), options['repeat'])
+        parse_us = self._time(lambda: template.expand(json.loads(answer)), options['repeat'])
+        output_tokens = estimate_tokens(answer)
+        self.stdout.write(
+            f"{template.version:<9}{weeks:>6}{estimate_tokens(prompt.prefix):>12}"
+            f"{estimate_tokens(prompt.request):>13}{output_tokens:>12}{budget or '-':>8}"
+            f"{build_us:>10.1f}{parse_us:>10.1f}{output_tokens / options['decode_rate']:>8.1f}"
+        )
+
+    def _run_live(self, generator, prompt, weeks, budget):
+        started = time.perf_counter()
+        response = generator.generate_response(prompt)
+        elapsed = time.perf_counter() - started
+        usage = response.usage_metadata
+        try:
+            milestones = len(generator._parse_response(response.text)['milestones'])
+        except Exception:
+            milestones = 'invalid'
+        self.stdout.write(
+            f"{prompt.version:<9}{weeks:>6}{usage.prompt_token_count:>12}"
+            f"{getattr(usage, 'cached_content_token_count', 0):>12}{usage.candidates_token_count:>12}"
+            f"{budget or '-':>8}{elapsed:>11.1f}{milestones:>12}"
+        )
+
+    def _live_generator(self, version, options):
+        # Imported here so the offline benchmark doesn't need the Gemini SDK
+        from learning_roadmap.services.gemini_service import GeminiRoadmapGenerator
+
+        return GeminiRoadmapGenerator(model_name=options['model'], prompt_version=version)
+
+    @staticmethod
+    def _time(func, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - started) * 1e6)
+        return statistics.median(timings)
+
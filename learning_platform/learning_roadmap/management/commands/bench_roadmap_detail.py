@@ -0,0 +1,86 @@
+# learning_roadmap/management/commands/bench_roadmap_detail.py
+
+import time
+import tracemalloc
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from learning_roadmap.models import Category, LearningGoal, Roadmap, Milestone, Resource
+from learning_roadmap.views import roadmap_detail, roadmap_week
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure peak memory, response size and query count of roadmap_detail for a long "
+        "roadmap, rendered in full (?all=1) and paged. Fixture data is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--weeks', type=int, default=52)
+        parser.add_argument('--milestones-per-week', type=int, default=3)
+        parser.add_argument('--resources-per-milestone', type=int, default=5)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            goal = self._build_fixture(options)
+            factory = RequestFactory()
+
+            rows = [
+                ('full (?all=1)', roadmap_detail, factory.get(f'/goal/{goal.id}/', {'all': '1'}), (goal.id,)),
+                ('paged', roadmap_detail, factory.get(f'/goal/{goal.id}/'), (goal.id,)),
+                ('week fragment', roadmap_week, factory.get(f'/goal/{goal.id}/week/10/'), (goal.id, 10)),
+            ]
+            self.stdout.write(f"{'mode':<16}{'bytes':>12}{'peak KiB':>12}{'queries':>10}{'ms':>10}")
+            for label, view, request, view_args in rows:
+                request.user = goal.user
+                self._measure(label, view, request, view_args)
+
+            transaction.set_rollback(True)
+
+    def _measure(self, label, view, request, view_args):
+        # Warm up template loading so it doesn't count against the first mode
+        view(request, *view_args)
+
+        tracemalloc.start()
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = view(request, *view_args)
+            elapsed = (time.perf_counter() - started) * 1000
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        self.stdout.write(
+            f"{label:<16}{len(response.content):>12,}{peak / 1024:>12,.0f}{len(queries):>10}{elapsed:>10.1f}"
+        )
+
+    def _build_fixture(self, options):
+        user = User.objects.create_user(username='bench-roadmap-detail')
+        category = Category.objects.create(name='Bench', category_type='coding')
+        goal = LearningGoal.objects.create(
+            user=user, category=category, title='Benchmark goal', description='Long roadmap',
+            difficulty_level='beginner', hours_per_week=10, target_duration_weeks=options['weeks'],
+        )
+        roadmap = Roadmap.objects.create(goal=goal, ai_summary='Benchmark roadmap')
+
+        milestones = Milestone.objects.bulk_create([
+            Milestone(
+                roadmap=roadmap, title=f'Week {week} milestone {n}', description='Lorem ipsum ' * 20,
+                week_number=week, order=n, estimated_hours=3, is_completed=week < 5,
+            )
+            for week in range(1, options['weeks'] + 1)
+            for n in range(1, options['milestones_per_week'] + 1)
+        ])
+        Resource.objects.bulk_create([
+            Resource(
+                milestone=milestone, title=f'Resource {n} for {milestone.title}',
+                url=f'https://example.com/{milestone.week_number}/{milestone.order}/{n}',
+                resource_type='article', description='A helpful resource ' * 5,
+            )
+            for milestone in milestones
+            for n in range(options['resources_per_milestone'])
+        ])
+        return goal
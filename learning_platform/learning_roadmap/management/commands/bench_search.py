@@ -0,0 +1,98 @@
+# learning_roadmap/management/commands/bench_search.py
+
+import random
+import statistics
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from learning_roadmap.models import Category, LearningGoal
+from learning_roadmap.services import search_service
+
+
+VOCABULARY = (
+    'python javascript react hooks state effect component django models views templates '
+    'sql joins index query async await promise closure scope array dictionary recursion '
+    'algorithm sorting graph tree heap spanish verbs grammar vocabulary pronunciation '
+    'listening reading strength cardio mobility squat deadlift running interval nutrition '
+    'video article course book practice beginner intermediate advanced project review'
+).split()
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark full-text search latency over a synthetic index. "
+        "Fixture rows are written inside a transaction and rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000000)
+        parser.add_argument('--users', type=int, default=200)
+        parser.add_argument('--goals-per-user', type=int, default=20)
+        parser.add_argument('--repeat', type=int, default=50)
+
+    def handle(self, *args, **options):
+        index = search_service.get_search_index()
+        if index is None:
+            raise CommandError(f"Full-text search is not supported on {connection.vendor}")
+        rng = random.Random(42)
+        # Topic words plus a long tail of filler tokens, so term frequencies
+        # look like real text rather than every word matching every row
+        filler = [''.join(rng.choices('abcdefghijklmnopqrstuvwxyz', k=rng.randint(4, 9))) for _ in range(20000)]
+
+        with transaction.atomic():
+            goals = self._build_goals(options)
+            started = time.perf_counter()
+            self._fill_index(index, goals, options['rows'], rng, filler)
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"Indexed {options['rows']:,} rows in {elapsed:.1f}s ({options['rows'] / elapsed:,.0f} rows/s)"
+            )
+
+            user = User.objects.get(pk=goals[0][1])
+            self.stdout.write(f"{'query':<28}{'hits':>6}{'p50 ms':>10}{'p95 ms':>10}")
+            for query in ['react', 'react hooks', 'react hooks video', 'recurs', 'deadlift nutrition', 'qxqxqxqxqx']:
+                timings = []
+                for _ in range(options['repeat']):
+                    started = time.perf_counter()
+                    results = search_service.search(user, query)
+                    timings.append((time.perf_counter() - started) * 1000)
+                timings.sort()
+                self.stdout.write(
+                    f"{query:<28}{len(results):>6}{statistics.median(timings):>10.2f}"
+                    f"{timings[int(len(timings) * 0.95) - 1]:>10.2f}"
+                )
+
+            transaction.set_rollback(True)
+
+    def _build_goals(self, options):
+        category = Category.objects.create(name='Bench', category_type='coding')
+        users = User.objects.bulk_create([
+            User(username=f'bench-search-{n}') for n in range(options['users'])
+        ])
+        goals = LearningGoal.objects.bulk_create([
+            LearningGoal(
+                user=user, category=category, title=f'Goal {n} for {user.username}', description='Benchmark',
+                difficulty_level='beginner', hours_per_week=5, target_duration_weeks=4,
+            )
+            for user in users
+            for n in range(options['goals_per_user'])
+        ])
+        return [(goal.pk, goal.user_id) for goal in goals]
+
+    def _fill_index(self, index, goals, rows, rng, filler):
+        batch = []
+        with connection.cursor() as cursor:
+            for n in range(rows):
+                goal_id, user_id = goals[n % len(goals)]
+                title = ' '.join(rng.choices(VOCABULARY, k=2) + rng.choices(filler, k=3))
+                body = ' '.join(rng.choices(VOCABULARY, k=3) + rng.choices(filler, k=27))
+                # Synthetic primary keys far above real ones so nothing collides
+                batch.append((search_service.make_rowid('resource', 10 ** 12 + n), goal_id, user_id, title, body))
+                if len(batch) >= 10000:
+                    index.upsert(cursor, batch)
+                    batch = []
+            if batch:
+                index.upsert(cursor, batch)
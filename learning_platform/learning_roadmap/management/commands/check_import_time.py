@@ -0,0 +1,85 @@
+# learning_roadmap/management/commands/check_import_time.py
+
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure startup import cost with `python -X importtime` and fail when "
+        "it exceeds the budget or pulls in a module that must stay lazy."
+    )
+
+    # Modules that must only be imported when a generation actually happens
+    FORBIDDEN_MODULES = ['google.generativeai', 'google.ai.generativelanguage', 'grpc']
+
+    def add_arguments(self, parser):
+        parser.add_argument('--budget-ms', type=float, default=1500,
+                            help='Maximum cumulative import time in milliseconds')
+        parser.add_argument('--module', action='append', dest='modules',
+                            help='Module to import after django.setup() (repeatable)')
+        parser.add_argument('--runs', type=int, default=3,
+                            help='Number of runs; the fastest is reported')
+        parser.add_argument('--top', type=int, default=15,
+                            help='Number of slowest imports to list')
+
+    def handle(self, *args, **options):
+        modules = options['modules'] or [settings.ROOT_URLCONF, 'learning_roadmap.views']
+        script = 'import django; django.setup(); ' + '; '.join(f'import {m}' for m in modules)
+
+        best = None
+        for _ in range(max(1, options['runs'])):
+            timings = self._measure(script)
+            total = sum(self_us for self_us, _, _ in timings.values())
+            if best is None or total < best[0]:
+                best = (total, timings)
+        total_us, timings = best
+
+        self.stdout.write(f"Imported {len(timings)} modules in {total_us / 1000:.1f} ms")
+        slowest = sorted(timings.items(), key=lambda item: item[1][1], reverse=True)
+        for name, (_, cumulative_us, depth) in slowest[:options['top']]:
+            self.stdout.write(f"  {cumulative_us / 1000:8.1f} ms  {'  ' * depth}{name}")
+
+        leaked = [m for m in self.FORBIDDEN_MODULES if m in timings]
+        if leaked:
+            raise CommandError(f"Heavy modules imported at startup: {', '.join(leaked)}")
+        if total_us / 1000 > options['budget_ms']:
+            raise CommandError(
+                f"Startup import time {total_us / 1000:.1f} ms exceeds budget of {options['budget_ms']:.0f} ms"
+            )
+        self.stdout.write(self.style.SUCCESS('Import time within budget'))
+
+    def _measure(self, script):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get(
+            'DJANGO_SETTINGS_MODULE', 'learning_platform.settings'))
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', script],
+            capture_output=True, text=True, env=env, cwd=settings.BASE_DIR,
+        )
+        if result.returncode != 0:
+            errors = [line for line in result.stderr.splitlines() if not line.startswith('import time:')]
+            raise CommandError("Import failed:\n" + '\n'.join(errors[-20:]))
+        return self._parse(result.stderr)
+
+    @staticmethod
+    def _parse(output):
+        """
+        Parse `-X importtime` lines of the form
+        `import time:   self [us] | cumulative | imported package`
+        into {module: (self_us, cumulative_us, depth)}
+        """
+        timings = {}
+        for line in output.splitlines():
+            if not line.startswith('import time:'):
+                continue
+            parts = line[len('import time:'):].split('|')
+            if len(parts) != 3 or not parts[0].strip().isdigit():
+                continue
+            name = parts[2].rstrip()
+            depth = (len(name) - len(name.lstrip()) - 1) // 2
+            timings[name.strip()] = (int(parts[0]), int(parts[1]), depth)
+        return timings
@@ -0,0 +1,33 @@
+# learning_roadmap/management/commands/check_links.py
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from learning_roadmap.models import LinkStatus, Resource
+from learning_roadmap.services.link_checker import get_link_checker_settings, refresh_link_statuses
+
+
+class Command(BaseCommand):
+    help = "Check resource URLs and record their health. Intended to run on a schedule (e.g. cron)."
+
+    def add_arguments(self, parser):
+        conf = get_link_checker_settings()
+        parser.add_argument('--max-age-hours', type=float, default=conf['MAX_AGE_HOURS'],
+                            help='Skip URLs checked more recently than this')
+        parser.add_argument('--all', action='store_true',
+                            help='Re-check every URL regardless of when it was last checked')
+        parser.add_argument('--flagged', action='store_true',
+                            help='Only re-check URLs currently flagged as broken or unreachable')
+
+    def handle(self, *args, **options):
+        if options['flagged']:
+            urls = LinkStatus.objects.exclude(status='ok').values_list('url', flat=True)
+        else:
+            urls = Resource.objects.values_list('url', flat=True).distinct()
+        max_age = None if options['all'] or options['flagged'] else timedelta(hours=options['max_age_hours'])
+
+        checked = refresh_link_statuses(urls.iterator(chunk_size=2000), max_age=max_age)
+
+        flagged = LinkStatus.objects.exclude(status='ok').count()
+        self.stdout.write(self.style.SUCCESS(f"Checked {checked} URLs; {flagged} currently flagged"))
@@ -0,0 +1,48 @@
+# learning_roadmap/management/commands/export_roadmaps.py
+
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from learning_roadmap.models import LearningGoal
+from learning_roadmap.services.export_service import EXPORT_FORMATS, iter_goal_records
+
+
+class Command(BaseCommand):
+    help = "Stream goals with their roadmaps to JSON Lines or CSV."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=sorted(EXPORT_FORMATS), default='jsonl')
+        parser.add_argument('--user', help='Only export this username; default is the whole install')
+        parser.add_argument('--output', '-o', help='File to write; defaults to stdout')
+        parser.add_argument('--chunk-size', type=int, default=200,
+                            help='Goals fetched per round trip')
+
+    def handle(self, *args, **options):
+        goals = LearningGoal.objects.all()
+        if options['user']:
+            goals = goals.filter(user__username=options['user'])
+            if not goals.exists():
+                raise CommandError(f"No goals found for user '{options['user']}'")
+
+        serializer = EXPORT_FORMATS[options['format']][0]
+        goal_count = 0
+
+        def counted(records):
+            nonlocal goal_count
+            for record in records:
+                goal_count += 1
+                yield record
+
+        started = time.perf_counter()
+        output = open(options['output'], 'w', newline='', encoding='utf-8') if options['output'] else sys.stdout
+        try:
+            for chunk in serializer(counted(iter_goal_records(goals, chunk_size=options['chunk_size']))):
+                output.write(chunk)
+        finally:
+            if options['output']:
+                output.close()
+        elapsed = time.perf_counter() - started
+
+        self.stderr.write(self.style.SUCCESS(f"Exported {goal_count} goals in {elapsed:.2f}s"))
@@ -0,0 +1,66 @@
+# learning_roadmap/management/commands/import_roadmaps.py
+
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from learning_roadmap.services.import_service import RoadmapImporter, iter_jsonl_records
+
+
+class Command(BaseCommand):
+    help = (
+        "Import roadmaps from a JSON Lines file (one goal per line, as produced by "
+        "export_roadmaps). The whole file is written in one transaction. By default an invalid "
+        "record (bad schema or unknown user) aborts the import; with --skip-invalid invalid "
+        "records are reported and the valid ones are committed together."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='JSON Lines file to import')
+        parser.add_argument('--user', help="Assign every goal to this username instead of each record's 'user'")
+        parser.add_argument('--batch-size', type=int, default=500, help='Goals written per bulk_create batch')
+        parser.add_argument('--no-index', action='store_true',
+                            help='Skip search indexing; run rebuild_search_index afterwards')
+        parser.add_argument('--skip-invalid', action='store_true',
+                            help='Skip and report invalid records instead of aborting; the valid ones '
+                                 'are still committed in a single transaction')
+
+    def handle(self, *args, **options):
+        user = None
+        if options['user']:
+            try:
+                user = User.objects.get(username=options['user'])
+            except User.DoesNotExist:
+                raise CommandError(f"User '{options['user']}' does not exist")
+
+        errors = []
+
+        def valid_records(f):
+            for line_number, record, error in iter_jsonl_records(f, importer):
+                if error:
+                    errors.append(f"line {line_number}: {error}")
+                    if not options['skip_invalid']:
+                        raise CommandError(f"line {line_number}: {error}; nothing imported")
+                    continue
+                yield record
+
+        started = time.perf_counter()
+        importer = RoadmapImporter(user=user, batch_size=options['batch_size'], index=not options['no_index'])
+        # One transaction for the whole file in both modes: a bad line aborts it before
+        # commit, and with --skip-invalid the valid records still land together or not at all
+        with transaction.atomic(), open(options['path'], encoding='utf-8') as f:
+            counts = importer.import_records(valid_records(f))
+        elapsed = time.perf_counter() - started
+
+        for error in errors[:50]:
+            self.stderr.write(error)
+        if len(errors) > 50:
+            self.stderr.write(f"... and {len(errors) - 50} more invalid records")
+
+        rows = sum(counts.values()) + counts['goals']  # goals also get a roadmap row
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {counts['goals']} goals, {counts['milestones']} milestones and "
+            f"{counts['resources']} resources in {elapsed:.2f}s ({rows / max(elapsed, 1e-9):,.0f} rows/s)"
+        ))
@@ -0,0 +1,31 @@
+# learning_roadmap/management/commands/purge_deleted_goals.py
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from learning_roadmap.services.purge_service import get_purge_settings, purge_deleted_goals
+
+
+class Command(BaseCommand):
+    help = "Remove soft-deleted goals and their roadmaps, milestones, resources and progress in batches."
+
+    def add_arguments(self, parser):
+        conf = get_purge_settings()
+        parser.add_argument('--batch-size', type=int, default=conf['BATCH_SIZE'],
+                            help='Rows deleted per statement')
+        parser.add_argument('--throttle', type=float, default=conf['THROTTLE_SECONDS'],
+                            help='Seconds to sleep between batches')
+        parser.add_argument('--max-goals', type=int, default=None,
+                            help='Stop after purging this many goals')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        counts = purge_deleted_goals(
+            batch_size=options['batch_size'],
+            throttle=options['throttle'],
+            max_goals=options['max_goals'],
+        )
+        elapsed = time.perf_counter() - started
+        summary = ', '.join(f"{count} {name}" for name, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f"Purged {summary} in {elapsed:.2f}s"))
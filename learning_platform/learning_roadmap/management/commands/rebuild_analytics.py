@@ -0,0 +1,37 @@
+# learning_roadmap/management/commands/rebuild_analytics.py
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from learning_roadmap.services.analytics_service import rebuild_analytics
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the category/difficulty analytics tables from scratch, report any drift from "
+        "the incrementally maintained values and replace them. Meant to run nightly, e.g. "
+        "`0 3 * * * python manage.py rebuild_analytics`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true',
+                            help='Only verify; exit with an error if any table has drifted')
+        parser.add_argument('--chunk-size', type=int, default=2000,
+                            help='Goals compared and written per batch')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        drift = rebuild_analytics(verify_only=options['check'], chunk_size=options['chunk_size'])
+        elapsed = time.perf_counter() - started
+
+        summary = ', '.join(f"{count} {name}" for name, count in drift.items())
+        if options['check']:
+            if any(drift.values()):
+                raise CommandError(f"Analytics have drifted: {summary}")
+            self.stdout.write(self.style.SUCCESS(f"Analytics verified in {elapsed:.2f}s; no drift"))
+            return
+
+        if any(drift.values()):
+            self.stdout.write(self.style.WARNING(f"Repaired drifted rows: {summary}"))
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt analytics in {elapsed:.2f}s"))
@@ -0,0 +1,38 @@
+# learning_roadmap/management/commands/rebuild_search_index.py
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from learning_roadmap.services.search_service import get_search_index, index_documents, iter_documents
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index, streaming rows so memory stays constant."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000,
+                            help='Documents read and written per batch')
+
+    def handle(self, *args, **options):
+        index = get_search_index()
+        if index is None:
+            raise CommandError(f"Full-text search is not supported on {connection.vendor}")
+
+        started = time.perf_counter()
+        with connection.cursor() as cursor:
+            index.clear(cursor)
+
+        count = index_documents(
+            iter_documents(chunk_size=options['batch_size']),
+            batch_size=options['batch_size'],
+        )
+
+        with connection.cursor() as cursor:
+            index.optimize(cursor)
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {count} documents in {elapsed:.1f}s ({count / max(elapsed, 1e-9):,.0f} docs/s)"
+        ))
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-19 04:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning_roadmap', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LinkStatus',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.URLField(unique=True)),
+                ('status', models.CharField(choices=[('ok', 'OK'), ('broken', 'Broken'), ('error', 'Unreachable')], max_length=20)),
+                ('http_status', models.IntegerField(blank=True, null=True)),
+                ('error', models.CharField(blank=True, max_length=300)),
+                ('response_ms', models.IntegerField(blank=True, null=True)),
+                ('last_checked_at', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Link statuses',
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 04:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning_roadmap', '0002_linkstatus'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='learninggoal',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
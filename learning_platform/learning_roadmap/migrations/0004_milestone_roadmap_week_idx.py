@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-19 04:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning_roadmap', '0003_learninggoal_deleted_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='milestone',
+            index=models.Index(fields=['roadmap', 'week_number', 'order'], name='milestone_roadmap_week_idx'),
+        ),
+    ]
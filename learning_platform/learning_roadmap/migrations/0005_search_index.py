@@ -0,0 +1,49 @@
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE learning_roadmap_search_fts USING fts5("
+            "title, body, owner, goal_id UNINDEXED, "
+            "tokenize = 'porter unicode61 remove_diacritics 2')"
+        )
+    elif vendor == 'postgresql':
+        schema_editor.execute(
+            "CREATE TABLE learning_roadmap_search_pg ("
+            "id bigint PRIMARY KEY, "
+            "goal_id bigint NOT NULL, "
+            "user_id integer NOT NULL, "
+            "title text NOT NULL, "
+            "body text NOT NULL, "
+            "document tsvector GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('english', title), 'A') || "
+            "setweight(to_tsvector('english', body), 'B')) STORED)"
+        )
+        schema_editor.execute(
+            "CREATE INDEX learning_roadmap_search_pg_document_idx "
+            "ON learning_roadmap_search_pg USING GIN (document)"
+        )
+        schema_editor.execute(
+            "CREATE INDEX learning_roadmap_search_pg_user_idx ON learning_roadmap_search_pg (user_id)"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute("DROP TABLE IF EXISTS learning_roadmap_search_fts")
+    elif vendor == 'postgresql':
+        schema_editor.execute("DROP TABLE IF EXISTS learning_roadmap_search_pg")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning_roadmap', '0004_milestone_roadmap_week_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 4.2.30 on 2026-10-19 04:21
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning_roadmap', '0005_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GoalStats',
+            fields=[
+                ('goal', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='analytics', serialize=False, to='learning_roadmap.learninggoal')),
+                ('difficulty_level', models.CharField(choices=[('beginner', 'Beginner'), ('intermediate', 'Intermediate'), ('advanced', 'Advanced')], max_length=20)),
+                ('total_milestones', models.IntegerField(default=0)),
+                ('completed_milestones', models.IntegerField(default=0)),
+                ('finished_weeks', models.IntegerField(blank=True, null=True)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='learning_roadmap.category')),
+            ],
+            options={
+                'verbose_name_plural': 'Goal stats',
+            },
+        ),
+        migrations.CreateModel(
+            name='ResourceCompletionStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.URLField()),
+                ('title', models.CharField(max_length=300)),
+                ('completions', models.IntegerField(default=0)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='learning_roadmap.category')),
+            ],
+            options={
+                'verbose_name_plural': 'Resource completion stats',
+                'indexes': [models.Index(fields=['category', '-completions'], name='resource_stats_top_idx')],
+                'unique_together': {('category', 'url')},
+            },
+        ),
+        migrations.CreateModel(
+            name='CohortStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('difficulty_level', models.CharField(choices=[('beginner', 'Beginner'), ('intermediate', 'Intermediate'), ('advanced', 'Advanced')], max_length=20)),
+                ('goals', models.IntegerField(default=0)),
+                ('milestones', models.IntegerField(default=0)),
+                ('completed_milestones', models.IntegerField(default=0)),
+                ('completion_rate_sum', models.FloatField(default=0)),
+                ('finished_goals', models.IntegerField(default=0)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cohort_stats', to='learning_roadmap.category')),
+            ],
+            options={
+                'verbose_name_plural': 'Cohort stats',
+                'unique_together': {('category', 'difficulty_level')},
+            },
+        ),
+        migrations.CreateModel(
+            name='CohortFinishWeeks',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('difficulty_level', models.CharField(choices=[('beginner', 'Beginner'), ('intermediate', 'Intermediate'), ('advanced', 'Advanced')], max_length=20)),
+                ('weeks', models.IntegerField()),
+                ('goals', models.IntegerField(default=0)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='learning_roadmap.category')),
+            ],
+            options={
+                'verbose_name_plural': 'Cohort finish weeks',
+                'unique_together': {('category', 'difficulty_level', 'weeks')},
+            },
+        ),
+    ]
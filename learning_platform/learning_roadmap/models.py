@@ -39,9 +39,16 @@ class LearningGoal(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
+    # Tombstone set on delete; the rows are removed later by the purger
+    deleted_at = models.DateTimeField(null=True, blank=True, db_index=True)
     
     def __str__(self):
         return f"{self.user.username} - {self.title}"
+    
+    def soft_delete(self):
+        self.is_active = False
+        self.deleted_at = timezone.now()
+        self.save(update_fields=['is_active', 'deleted_at'])
 
 
 class Roadmap(models.Model):
@@ -72,6 +79,9 @@ class Milestone(models.Model):
     
     class Meta:
         ordering = ['week_number', 'order']
+        indexes = [
+            models.Index(fields=['roadmap', 'week_number', 'order'], name='milestone_roadmap_week_idx'),
+        ]
     
     def __str__(self):
         return f"Week {self.week_number}: {self.title}"
@@ -101,6 +111,105 @@ class Resource(models.Model):
         return self.title
 
 
+class LinkStatus(models.Model):
+    STATUS_CHOICES = [
+        ('ok', 'OK'),
+        ('broken', 'Broken'),
+        ('error', 'Unreachable'),
+    ]
+    
+    url = models.URLField(unique=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES)
+    http_status = models.IntegerField(null=True, blank=True)
+    error = models.CharField(max_length=300, blank=True)
+    response_ms = models.IntegerField(null=True, blank=True)
+    last_checked_at = models.DateTimeField(db_index=True)
+    
+    class Meta:
+        verbose_name_plural = "Link statuses"
+    
+    def __str__(self):
+        return f"{self.url} ({self.status})"
+    
+    @property
+    def is_flagged(self):
+        return self.status != 'ok'
+
+
+class GoalStats(models.Model):
+    """Per-goal completion counters, kept in step with the cohort aggregates"""
+    
+    goal = models.OneToOneField(LearningGoal, on_delete=models.CASCADE, primary_key=True, related_name='analytics')
+    # The cohort the goal was counted in, so removal subtracts from the same row
+    category = models.ForeignKey(Category, on_delete=models.CASCADE)
+    difficulty_level = models.CharField(max_length=20, choices=LearningGoal.DIFFICULTY_CHOICES)
+    total_milestones = models.IntegerField(default=0)
+    completed_milestones = models.IntegerField(default=0)
+    # Weeks from creation to the last milestone, set once every milestone is done
+    finished_weeks = models.IntegerField(null=True, blank=True)
+    
+    class Meta:
+        verbose_name_plural = "Goal stats"
+    
+    def __str__(self):
+        return f"{self.goal_id}: {self.completed_milestones}/{self.total_milestones}"
+
+
+class CohortStats(models.Model):
+    """Running totals for one category and difficulty level"""
+    
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='cohort_stats')
+    difficulty_level = models.CharField(max_length=20, choices=LearningGoal.DIFFICULTY_CHOICES)
+    goals = models.IntegerField(default=0)
+    milestones = models.IntegerField(default=0)
+    completed_milestones = models.IntegerField(default=0)
+    # Sum of each goal's completed/total ratio; divided by goals for the average
+    completion_rate_sum = models.FloatField(default=0)
+    finished_goals = models.IntegerField(default=0)
+    
+    class Meta:
+        verbose_name_plural = "Cohort stats"
+        unique_together = ['category', 'difficulty_level']
+    
+    def __str__(self):
+        return f"{self.category_id} / {self.difficulty_level}"
+
+
+class CohortFinishWeeks(models.Model):
+    """Histogram of weeks-to-finish per cohort, for medians without touching goals"""
+    
+    category = models.ForeignKey(Category, on_delete=models.CASCADE)
+    difficulty_level = models.CharField(max_length=20, choices=LearningGoal.DIFFICULTY_CHOICES)
+    weeks = models.IntegerField()
+    goals = models.IntegerField(default=0)
+    
+    class Meta:
+        verbose_name_plural = "Cohort finish weeks"
+        unique_together = ['category', 'difficulty_level', 'weeks']
+    
+    def __str__(self):
+        return f"{self.category_id} / {self.difficulty_level}: {self.weeks} weeks"
+
+
+class ResourceCompletionStats(models.Model):
+    """How many live roadmaps in a category have completed a resource URL"""
+    
+    category = models.ForeignKey(Category, on_delete=models.CASCADE)
+    url = models.URLField()
+    title = models.CharField(max_length=300)
+    completions = models.IntegerField(default=0)
+    
+    class Meta:
+        verbose_name_plural = "Resource completion stats"
+        unique_together = ['category', 'url']
+        indexes = [
+            models.Index(fields=['category', '-completions'], name='resource_stats_top_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.title} ({self.completions})"
+
+
 class Progress(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='progress')
     milestone = models.ForeignKey(Milestone, on_delete=models.CASCADE)
@@ -0,0 +1,46 @@
+# learning_roadmap/paginators.py
+
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+class ApproximateCountPaginator(Paginator):
+    """
+    Paginator that stops counting once a result set is known to be large.
+
+    Counts are exact up to EXACT_LIMIT rows, using a LIMITed subquery so the
+    database can stop early. Past that, an unfiltered changelist uses the
+    planner's row estimate (Postgres) or the highest primary key (SQLite),
+    and a filtered one reports EXACT_LIMIT.
+    """
+
+    EXACT_LIMIT = 10000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        counted = queryset.order_by()[:self.EXACT_LIMIT + 1].count()
+        if counted <= self.EXACT_LIMIT:
+            return counted
+        if not queryset.query.where:
+            estimate = self._estimate_table_rows(queryset)
+            if estimate:
+                return max(estimate, counted)
+        return self.EXACT_LIMIT
+
+    @staticmethod
+    def _estimate_table_rows(queryset):
+        model = queryset.model
+        connection = connections[queryset.db]
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE relname = %s", [model._meta.db_table])
+            elif connection.vendor == 'sqlite':
+                pk_column = connection.ops.quote_name(model._meta.pk.column)
+                table = connection.ops.quote_name(model._meta.db_table)
+                cursor.execute(f"SELECT MAX({pk_column}) FROM {table}")
+            else:
+                return None
+            row = cursor.fetchone()
+        return int(row[0]) if row and row[0] else None
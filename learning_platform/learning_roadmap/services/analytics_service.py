@@ -0,0 +1,436 @@
+# learning_roadmap/services/analytics_service.py
+
+import copy
+import math
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, Max, Min, Q
+from django.utils import timezone
+
+from ..models import (
+    Category, LearningGoal, Milestone, Resource,
+    GoalStats, CohortStats, CohortFinishWeeks, ResourceCompletionStats,
+)
+
+
+ANALYTICS_CACHE_KEY = 'learning_roadmap:analytics'
+CHUNK_SIZE = 500
+WEEK_SECONDS = 7 * 24 * 3600
+
+COHORT_KEY = ('category_id', 'difficulty_level')
+WEEKS_KEY = ('category_id', 'difficulty_level', 'weeks')
+RESOURCE_KEY = ('category_id', 'url')
+
+
+def get_analytics_settings():
+    conf = {
+        'CACHE_SECONDS': 300,
+        'TOP_RESOURCES': 5,
+    }
+    conf.update(getattr(settings, 'ANALYTICS', {}))
+    return conf
+
+
+def _chunks(items: List, size: int = CHUNK_SIZE) -> Iterator[List]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _weeks_between(start, end) -> int:
+    """Whole weeks from start to end, rounded up; finishing inside the first week counts as 1"""
+    return max(1, math.ceil((end - start).total_seconds() / WEEK_SECONDS))
+
+
+def _contribution(stats: GoalStats) -> Dict[str, float]:
+    """What one goal adds to its cohort row"""
+    total = stats.total_milestones
+    return {
+        'goals': 1,
+        'milestones': total,
+        'completed_milestones': stats.completed_milestones,
+        'completion_rate_sum': stats.completed_milestones / total if total else 0.0,
+        'finished_goals': int(stats.finished_weeks is not None),
+    }
+
+
+def _apply_deltas(model, key_fields: Tuple[str, ...], deltas: Dict[tuple, Dict[str, float]], defaults=None):
+    """
+    Add deltas to aggregate rows, creating missing rows first.
+
+    Updates use F() expressions so concurrent toggles on the same row don't
+    overwrite each other. defaults maps a key to the non-counter fields to
+    set when its row is created.
+    """
+    deltas = {key: values for key, values in deltas.items() if any(values.values())}
+    if not deltas:
+        return
+    defaults = defaults or {}
+    model.objects.bulk_create(
+        [model(**dict(zip(key_fields, key)), **defaults.get(key, {})) for key in deltas],
+        ignore_conflicts=True,
+    )
+    for key, values in deltas.items():
+        model.objects.filter(**dict(zip(key_fields, key))).update(
+            **{field: F(field) + value for field, value in values.items() if value}
+        )
+
+
+def _apply_goal_changes(changes: Iterable[Tuple[Optional[GoalStats], Optional[GoalStats]]]):
+    """Move each goal's contribution from its before snapshot to its after snapshot (None for absent)"""
+    cohorts = defaultdict(lambda: defaultdict(int))
+    weeks = defaultdict(lambda: defaultdict(int))
+    for before, after in changes:
+        for stats, sign in ((before, -1), (after, 1)):
+            if stats is None:
+                continue
+            key = (stats.category_id, stats.difficulty_level)
+            for field, value in _contribution(stats).items():
+                cohorts[key][field] += sign * value
+            if stats.finished_weeks is not None:
+                weeks[key + (stats.finished_weeks,)]['goals'] += sign
+
+    _apply_deltas(CohortStats, COHORT_KEY, cohorts)
+    _apply_deltas(CohortFinishWeeks, WEEKS_KEY, weeks)
+
+
+def _apply_resource_completions(goal_ids: List[int], sign: int):
+    """Add (sign=1) or subtract (sign=-1) the completed resources of goals that have GoalStats"""
+    deltas = defaultdict(lambda: defaultdict(int))
+    titles = {}
+    rows = (
+        Resource.objects.filter(milestone__roadmap__goal_id__in=goal_ids, is_completed=True,
+                                milestone__roadmap__goal__analytics__isnull=False)
+        .values_list('milestone__roadmap__goal__analytics__category_id', 'url')
+        .annotate(completions=Count('id'), title=Min('title'))
+    )
+    for category_id, url, completions, title in rows:
+        deltas[(category_id, url)]['completions'] += sign * completions
+        titles[(category_id, url)] = {'title': title}
+    _apply_deltas(ResourceCompletionStats, RESOURCE_KEY, deltas, defaults=titles)
+
+
+def compute_goal_stats(goals) -> Iterator[GoalStats]:
+    """Build unsaved GoalStats for a queryset of goals straight from their milestones"""
+    rows = (
+        goals.order_by('id')
+        .annotate(
+            total=Count('roadmap__milestones'),
+            completed=Count('roadmap__milestones', filter=Q(roadmap__milestones__is_completed=True)),
+            last_completed=Max('roadmap__milestones__completed_at'),
+        )
+        .values_list('id', 'category_id', 'difficulty_level', 'created_at', 'total', 'completed', 'last_completed')
+        .iterator(chunk_size=2000)
+    )
+    for goal_id, category_id, difficulty, created_at, total, completed, last_completed in rows:
+        finished = total and completed == total and last_completed is not None
+        yield GoalStats(
+            goal_id=goal_id,
+            category_id=category_id,
+            difficulty_level=difficulty,
+            total_milestones=total,
+            completed_milestones=completed,
+            finished_weeks=_weeks_between(created_at, last_completed) if finished else None,
+        )
+
+
+def add_goals(goal_ids: Iterable[int]) -> int:
+    """
+    Count goals into the aggregates from their current rows.
+
+    Call after a goal's roadmap is written (create, import, regenerate).
+    Goals that are already counted or tombstoned are skipped, so calling it
+    twice is harmless.
+    """
+    added = 0
+    for chunk in _chunks(list(goal_ids)):
+        with transaction.atomic():
+            counted = set(GoalStats.objects.filter(goal_id__in=chunk).values_list('goal_id', flat=True))
+            new_ids = [goal_id for goal_id in chunk if goal_id not in counted]
+            stats = list(compute_goal_stats(
+                LearningGoal.objects.filter(id__in=new_ids, deleted_at__isnull=True)
+            ))
+            if not stats:
+                continue
+            GoalStats.objects.bulk_create(stats)
+            _apply_goal_changes((None, s) for s in stats)
+            _apply_resource_completions([s.goal_id for s in stats], 1)
+            added += len(stats)
+    return added
+
+
+def remove_goals(goal_ids: Iterable[int]) -> int:
+    """
+    Take goals out of the aggregates.
+
+    Call before their rows change wholesale or disappear (soft delete,
+    regenerate, bulk admin actions); the resource counts are subtracted
+    from the rows as they are now.
+    """
+    removed = 0
+    for chunk in _chunks(list(goal_ids)):
+        with transaction.atomic():
+            stats = list(GoalStats.objects.select_for_update().filter(goal_id__in=chunk))
+            if not stats:
+                continue
+            _apply_goal_changes((s, None) for s in stats)
+            _apply_resource_completions([s.goal_id for s in stats], -1)
+            GoalStats.objects.filter(goal_id__in=[s.goal_id for s in stats]).delete()
+            removed += len(stats)
+    return removed
+
+
+@transaction.atomic
+def record_milestone_toggle(milestone: Milestone, goal: LearningGoal):
+    """Apply one milestone's completion toggle (already saved) to the aggregates"""
+    stats = GoalStats.objects.select_for_update().filter(goal_id=goal.pk).first()
+    if stats is None:
+        # Not counted yet (e.g. created before the aggregates existed); count it now
+        add_goals([goal.pk])
+        return
+
+    before = copy.copy(stats)
+    stats.completed_milestones += 1 if milestone.is_completed else -1
+    finished = stats.total_milestones and stats.completed_milestones == stats.total_milestones
+    stats.finished_weeks = _weeks_between(goal.created_at, milestone.completed_at) if finished else None
+    stats.save(update_fields=['completed_milestones', 'finished_weeks'])
+    _apply_goal_changes([(before, stats)])
+
+
+@transaction.atomic
+def record_resource_toggle(resource: Resource, goal: LearningGoal):
+    """Apply one resource's completion toggle (already saved) to the aggregates"""
+    stats = GoalStats.objects.filter(goal_id=goal.pk).first()
+    if stats is None:
+        add_goals([goal.pk])
+        return
+
+    key = (stats.category_id, resource.url)
+    _apply_deltas(
+        ResourceCompletionStats, RESOURCE_KEY,
+        {key: {'completions': 1 if resource.is_completed else -1}},
+        defaults={key: {'title': resource.title}},
+    )
+
+
+def _median_weeks(histogram: Dict[int, int]) -> Optional[float]:
+    total = sum(histogram.values())
+    if not total:
+        return None
+    middle = {(total - 1) // 2, total // 2}
+    values, seen = [], 0
+    for weeks in sorted(histogram):
+        for position in sorted(middle):
+            if seen <= position < seen + histogram[weeks]:
+                values.append(weeks)
+        seen += histogram[weeks]
+    return sum(values) / len(values)
+
+
+def _summarize(label: str, rows: List[CohortStats], histogram: Dict[int, int]) -> Dict:
+    goals = sum(row.goals for row in rows)
+    return {
+        'label': label,
+        'goals': goals,
+        'milestones': sum(row.milestones for row in rows),
+        'completion_rate': round(100 * sum(row.completion_rate_sum for row in rows) / goals, 1) if goals else 0,
+        'finished_goals': sum(row.finished_goals for row in rows),
+        'median_weeks': _median_weeks(histogram),
+    }
+
+
+def compute_analytics(top_resources: int = None) -> Dict:
+    """
+    Read the stats off the aggregate tables.
+
+    Cost depends on the number of categories and difficulty levels (plus
+    distinct finish-week buckets), not on the number of goals or milestones.
+    """
+    if top_resources is None:
+        top_resources = get_analytics_settings()['TOP_RESOURCES']
+    difficulty_labels = dict(LearningGoal.DIFFICULTY_CHOICES)
+
+    cohorts = defaultdict(dict)
+    for row in CohortStats.objects.filter(goals__gt=0):
+        cohorts[row.category_id][row.difficulty_level] = row
+
+    histograms = defaultdict(lambda: defaultdict(int))
+    for category_id, difficulty, weeks, goals in (
+        CohortFinishWeeks.objects.filter(goals__gt=0)
+        .values_list('category_id', 'difficulty_level', 'weeks', 'goals')
+    ):
+        histograms[(category_id, difficulty)][weeks] += goals
+
+    def histogram_for(keys):
+        merged = defaultdict(int)
+        for key in keys:
+            for weeks, goals in histograms[key].items():
+                merged[weeks] += goals
+        return merged
+
+    categories = []
+    for category in Category.objects.filter(id__in=list(cohorts)).order_by('name'):
+        by_difficulty = cohorts[category.id]
+        top = ResourceCompletionStats.objects.filter(
+            category=category, completions__gt=0
+        ).order_by('-completions', 'title').values('title', 'url', 'completions')[:top_resources]
+        categories.append({
+            'summary': _summarize(
+                category.name, list(by_difficulty.values()),
+                histogram_for((category.id, difficulty) for difficulty in by_difficulty),
+            ),
+            'cohorts': [
+                _summarize(difficulty_labels[difficulty], [by_difficulty[difficulty]],
+                           histograms[(category.id, difficulty)])
+                for difficulty in difficulty_labels if difficulty in by_difficulty
+            ],
+            'top_resources': list(top),
+        })
+
+    difficulties = []
+    for difficulty, label in difficulty_labels.items():
+        rows = [by_difficulty[difficulty] for by_difficulty in cohorts.values() if difficulty in by_difficulty]
+        if rows:
+            difficulties.append(_summarize(
+                label, rows, histogram_for((category_id, difficulty) for category_id in cohorts)
+            ))
+
+    return {
+        'categories': categories,
+        'difficulties': difficulties,
+        'generated_at': timezone.now(),
+    }
+
+
+def get_analytics() -> Dict:
+    """compute_analytics(), cached for ANALYTICS['CACHE_SECONDS']"""
+    return cache.get_or_set(ANALYTICS_CACHE_KEY, compute_analytics, get_analytics_settings()['CACHE_SECONDS'])
+
+
+def _same_goal_stats(a: GoalStats, b: GoalStats) -> bool:
+    return (a.category_id, a.difficulty_level, a.total_milestones, a.completed_milestones, a.finished_weeks) == (
+        b.category_id, b.difficulty_level, b.total_milestones, b.completed_milestones, b.finished_weeks)
+
+
+def _same_cohort(stored: CohortStats, expected: Dict) -> bool:
+    return all(
+        math.isclose(getattr(stored, field), value, abs_tol=1e-6)
+        for field, value in expected.items()
+    )
+
+
+def _key_drift(stored: Dict, expected: Dict, same) -> int:
+    """Rows missing from either side plus rows whose values differ"""
+    return len(stored.keys() ^ expected.keys()) + sum(
+        not same(stored[key], value) for key, value in expected.items() if key in stored
+    )
+
+
+def _live_goal_chunks(chunk_size: int) -> Iterator[List[GoalStats]]:
+    """Recomputed GoalStats for every live goal, chunk_size goals at a time, walking primary keys"""
+    live = LearningGoal.objects.filter(deleted_at__isnull=True).order_by('id')
+    last_id = 0
+    while True:
+        ids = list(live.filter(id__gt=last_id).values_list('id', flat=True)[:chunk_size])
+        if not ids:
+            return
+        yield list(compute_goal_stats(live.filter(id__gte=ids[0], id__lte=ids[-1])))
+        last_id = ids[-1]
+
+
+def rebuild_analytics(verify_only: bool = False, chunk_size: int = 2000) -> Dict[str, int]:
+    """
+    Recompute the aggregates from the base tables and compare them with the stored ones.
+
+    Returns the number of drifted rows per table (missing, stale or extra).
+    Unless verify_only, the stored rows are replaced with the recomputed
+    values and the analytics cache is cleared. GoalStats are compared and
+    written a chunk at a time, so memory depends on the number of cohorts
+    and completed resource URLs, not on the number of goals.
+
+    Each GoalStats chunk commits on its own and the cohort, finish-week and
+    resource aggregates are computed outside any transaction, then swapped
+    in by one short transaction at the end; completion toggles only wait
+    for a chunk or the swap, never for the whole scan. A toggle landing
+    between the scan and the swap is lost from the cohort tables until the
+    next rebuild, the same drift this command exists to repair.
+    """
+    drift = {'goal_stats': 0, 'cohorts': 0, 'finish_weeks': 0, 'resources': 0}
+    cohorts = {}
+    weeks = defaultdict(int)
+
+    for chunk in _live_goal_chunks(chunk_size):
+        for stats in chunk:
+            row = cohorts.setdefault((stats.category_id, stats.difficulty_level), defaultdict(int))
+            for field, value in _contribution(stats).items():
+                row[field] += value
+            if stats.finished_weeks is not None:
+                weeks[(stats.category_id, stats.difficulty_level, stats.finished_weeks)] += 1
+
+        with transaction.atomic():
+            stored = GoalStats.objects.in_bulk([stats.goal_id for stats in chunk])
+            drift['goal_stats'] += _key_drift(stored, {stats.goal_id: stats for stats in chunk}, _same_goal_stats)
+            if not verify_only:
+                GoalStats.objects.bulk_create(
+                    chunk, update_conflicts=True, unique_fields=['goal'],
+                    update_fields=['category', 'difficulty_level', 'total_milestones',
+                                   'completed_milestones', 'finished_weeks'],
+                )
+
+    # Every live goal was upserted above; what's left belongs to tombstoned goals
+    orphaned = GoalStats.objects.filter(goal__deleted_at__isnull=False)
+    drift['goal_stats'] += orphaned.count()
+
+    resources = {
+        (category_id, url): (completions, title) for category_id, url, completions, title in (
+            Resource.objects.filter(is_completed=True, milestone__roadmap__goal__deleted_at__isnull=True)
+            .values_list('milestone__roadmap__goal__category_id', 'url')
+            .annotate(completions=Count('id'), title=Min('title'))
+            .iterator(chunk_size=chunk_size)
+        )
+    }
+
+    stored_cohorts = {
+        (row.category_id, row.difficulty_level): row for row in CohortStats.objects.filter(goals__gt=0)
+    }
+    stored_weeks = {
+        (category_id, difficulty, week): goals for category_id, difficulty, week, goals in
+        CohortFinishWeeks.objects.filter(goals__gt=0).values_list('category_id', 'difficulty_level', 'weeks', 'goals')
+    }
+    stored_resources = {
+        (category_id, url): completions for category_id, url, completions in
+        ResourceCompletionStats.objects.filter(completions__gt=0).values_list('category_id', 'url', 'completions')
+        .iterator(chunk_size=chunk_size)
+    }
+    drift['cohorts'] = _key_drift(stored_cohorts, cohorts, _same_cohort)
+    drift['finish_weeks'] = _key_drift(stored_weeks, weeks, lambda a, b: a == b)
+    drift['resources'] = _key_drift(stored_resources, resources, lambda a, b: a == b[0])
+    if verify_only:
+        return drift
+
+    # Build the replacement rows before taking the write lock
+    new_cohorts = [
+        CohortStats(category_id=category_id, difficulty_level=difficulty, **row)
+        for (category_id, difficulty), row in cohorts.items()
+    ]
+    new_weeks = [
+        CohortFinishWeeks(category_id=category_id, difficulty_level=difficulty, weeks=week, goals=goals)
+        for (category_id, difficulty, week), goals in weeks.items()
+    ]
+    new_resources = [
+        ResourceCompletionStats(category_id=category_id, url=url, title=title, completions=completions)
+        for (category_id, url), (completions, title) in resources.items()
+    ]
+    with transaction.atomic():
+        orphaned.delete()
+        CohortStats.objects.all().delete()
+        CohortStats.objects.bulk_create(new_cohorts)
+        CohortFinishWeeks.objects.all().delete()
+        CohortFinishWeeks.objects.bulk_create(new_weeks)
+        ResourceCompletionStats.objects.all().delete()
+        ResourceCompletionStats.objects.bulk_create(new_resources, batch_size=chunk_size)
+        transaction.on_commit(lambda: cache.delete(ANALYTICS_CACHE_KEY))
+    return drift
@@ -0,0 +1,76 @@
+# learning_roadmap/services/backends.py
+
+import threading
+from typing import Dict, List, Protocol
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+DEFAULT_BACKENDS = {
+    'gemini': 'learning_roadmap.services.gemini_service.GeminiRoadmapGenerator',
+    'template': 'learning_roadmap.services.template_service.TemplateRoadmapGenerator',
+    'fake': 'learning_roadmap.services.fake_service.FakeRoadmapGenerator',
+}
+
+
+class RoadmapBackend(Protocol):
+    """Interface every roadmap generator backend implements"""
+
+    def generate_roadmap(self, goal_data: Dict, timeout: float = None) -> Dict:
+        ...
+
+    def suggest_resources(self, topic: str, difficulty: str, count: int = 5) -> List[Dict]:
+        ...
+
+
+class LazyBackend:
+    """
+    Defers importing and constructing a backend until its first call.
+
+    Keeps heavy provider SDKs (e.g. google.generativeai) out of the import
+    path of management commands, tests and worker boot.
+    """
+
+    def __init__(self, name: str, path: str, options: Dict = None):
+        self.name = name
+        self.path = path
+        self.options = options or {}
+        self._instance = None
+        self._lock = threading.Lock()
+
+    def load(self) -> RoadmapBackend:
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    backend_class = import_string(self.path)
+                    self._instance = backend_class(**self.options)
+        return self._instance
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._instance is not None
+
+    def generate_roadmap(self, goal_data: Dict, timeout: float = None) -> Dict:
+        return self.load().generate_roadmap(goal_data, timeout=timeout)
+
+    def suggest_resources(self, topic: str, difficulty: str, count: int = 5) -> List[Dict]:
+        return self.load().suggest_resources(topic, difficulty, count)
+
+    def __repr__(self):
+        return f"<LazyBackend {self.name} ({self.path})>"
+
+
+def get_backend_registry() -> Dict[str, str]:
+    """Backend name -> dotted class path, overridable via settings.ROADMAP_BACKENDS"""
+    registry = dict(DEFAULT_BACKENDS)
+    registry.update(getattr(settings, 'ROADMAP_BACKENDS', {}))
+    return registry
+
+
+def get_backend(name: str, **options) -> LazyBackend:
+    """Return a lazily-loaded backend by its registered name"""
+    registry = get_backend_registry()
+    if name not in registry:
+        raise ValueError(f"Unknown generation backend: {name}")
+    return LazyBackend(name, registry[name], options)
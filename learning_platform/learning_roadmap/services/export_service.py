@@ -0,0 +1,129 @@
+# learning_roadmap/services/export_service.py
+
+import csv
+import json
+from collections import defaultdict
+from itertools import islice
+from typing import Dict, Iterable, Iterator
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from ..models import LearningGoal, Milestone, Resource
+
+
+GOAL_FIELDS = {
+    'id': 'id',
+    'user': 'user__username',
+    'title': 'title',
+    'description': 'description',
+    'category': 'category__name',
+    'category_type': 'category__category_type',
+    'difficulty_level': 'difficulty_level',
+    'hours_per_week': 'hours_per_week',
+    'target_duration_weeks': 'target_duration_weeks',
+    'created_at': 'created_at',
+}
+MILESTONE_FIELDS = ['id', 'week_number', 'order', 'title', 'description', 'estimated_hours',
+                    'is_completed', 'completed_at']
+RESOURCE_FIELDS = ['id', 'title', 'url', 'resource_type', 'is_free', 'estimated_duration', 'description',
+                   'is_completed', 'completed_at']
+
+CSV_COLUMNS = (
+    ['goal_' + name for name in GOAL_FIELDS]
+    + ['roadmap_summary']
+    + ['milestone_' + name for name in MILESTONE_FIELDS]
+    + ['resource_' + name for name in RESOURCE_FIELDS]
+)
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_goal_records(goals=None, chunk_size: int = 200) -> Iterator[Dict]:
+    """
+    Yield one nested record per goal, in the same shape import accepts.
+
+    Goals are streamed with iterator(); milestones and resources are fetched
+    per chunk of goals with values(), so memory depends on chunk_size, not on
+    the size of the export.
+    """
+    if goals is None:
+        goals = LearningGoal.objects.all()
+    rows = (
+        goals.filter(deleted_at__isnull=True).order_by('id')
+        .values_list(*GOAL_FIELDS.values(), 'roadmap__ai_summary')
+        .iterator(chunk_size=chunk_size)
+    )
+
+    for chunk in _chunks(rows, chunk_size):
+        goal_ids = [row[0] for row in chunk]
+
+        resources = defaultdict(list)
+        for resource in (
+            Resource.objects.filter(milestone__roadmap__goal_id__in=goal_ids)
+            .order_by('milestone_id', 'id').values('milestone_id', *RESOURCE_FIELDS)
+        ):
+            resources[resource.pop('milestone_id')].append(resource)
+
+        milestones = defaultdict(list)
+        for milestone in (
+            Milestone.objects.filter(roadmap__goal_id__in=goal_ids)
+            .order_by('week_number', 'order').values('roadmap__goal_id', *MILESTONE_FIELDS)
+        ):
+            milestone['resources'] = resources.pop(milestone['id'], [])
+            milestones[milestone.pop('roadmap__goal_id')].append(milestone)
+
+        for row in chunk:
+            record = dict(zip(GOAL_FIELDS, row))
+            summary = row[-1]
+            record['roadmap'] = None if summary is None else {
+                'summary': summary,
+                'milestones': milestones.pop(record['id'], []),
+            }
+            yield record
+
+
+def iter_jsonl(records: Iterable[Dict]) -> Iterator[str]:
+    for record in records:
+        yield json.dumps(record, cls=DjangoJSONEncoder) + '\n'
+
+
+class _Echo:
+    """File-like object whose write() returns the value, for streaming csv.writer output"""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(records: Iterable[Dict]) -> Iterator[str]:
+    """Flatten records to one CSV row per resource (or per milestone without resources)"""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(CSV_COLUMNS)
+
+    empty_milestone = [''] * len(MILESTONE_FIELDS)
+    empty_resource = [''] * len(RESOURCE_FIELDS)
+    for record in records:
+        goal = [record[name] for name in GOAL_FIELDS]
+        roadmap = record['roadmap'] or {'summary': '', 'milestones': []}
+        goal.append(roadmap['summary'])
+
+        if not roadmap['milestones']:
+            yield writer.writerow(goal + empty_milestone + empty_resource)
+        for milestone in roadmap['milestones']:
+            milestone_row = goal + [milestone[name] for name in MILESTONE_FIELDS]
+            if not milestone['resources']:
+                yield writer.writerow(milestone_row + empty_resource)
+            for resource in milestone['resources']:
+                yield writer.writerow(milestone_row + [resource[name] for name in RESOURCE_FIELDS])
+
+
+EXPORT_FORMATS = {
+    'jsonl': (iter_jsonl, 'application/x-ndjson', 'jsonl'),
+    'csv': (iter_csv, 'text/csv', 'csv'),
+}
@@ -0,0 +1,37 @@
+# learning_roadmap/services/fake_service.py
+
+import time
+from typing import Dict, List
+
+from .template_service import TemplateRoadmapGenerator
+
+
+class FakeRoadmapGenerator:
+    """
+    In-memory backend for tests and load experiments.
+
+    Returns template roadmaps after an optional artificial delay, can be
+    told to fail, and records every call it receives.
+    """
+
+    def __init__(self, latency: float = 0, fail: bool = False, error_message: str = 'Fake backend failure'):
+        self.latency = latency
+        self.fail = fail
+        self.error_message = error_message
+        self.calls = []
+        self._template = TemplateRoadmapGenerator()
+
+    def _call(self, method: str, *args):
+        self.calls.append((method, args))
+        if self.latency:
+            time.sleep(self.latency)
+        if self.fail:
+            raise Exception(self.error_message)
+
+    def generate_roadmap(self, goal_data: Dict, timeout: float = None) -> Dict:
+        self._call('generate_roadmap', goal_data)
+        return self._template.generate_roadmap(goal_data)
+
+    def suggest_resources(self, topic: str, difficulty: str, count: int = 5) -> List[Dict]:
+        self._call('suggest_resources', topic, difficulty, count)
+        return self._template.suggest_resources(topic, difficulty, count)
@@ -6,14 +6,21 @@ from decouple import config
 import google.generativeai as genai
 from typing import Dict, List
 
+from .prompt_builder import DEFAULT_PROMPT_VERSION, RoadmapPrompt, get_prompt_template
+
 class GeminiRoadmapGenerator:
-    def __init__(self):
+    def __init__(self, model_name: str = 'gemini-1.5-flash', prompt_version: str = DEFAULT_PROMPT_VERSION):
         # Configure Gemini API using python-decouple
         api_key = config('GOOGLE_API_KEY')
         genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel('gemini-1.5-flash')
+        self.model_name = model_name
+        self.model = genai.GenerativeModel(model_name)
+        self.template = get_prompt_template(prompt_version)
+        # One model per static prefix, so the prefix is sent as an identical
+        # system instruction on every call and stays eligible for caching
+        self._prefixed_models = {}
     
-    def generate_roadmap(self, goal_data: Dict) -> Dict:
+    def generate_roadmap(self, goal_data: Dict, timeout: float = None) -> Dict:
         """
         Generate a learning roadmap based on user goals
         
@@ -22,76 +29,41 @@ class GeminiRoadmapGenerator:
                 - title: Goal title
                 - description: Goal description
                 - category: Learning category
+                - category_type: coding/language/fitness/other (selects the prompt prefix)
                 - difficulty_level: beginner/intermediate/advanced
                 - hours_per_week: Available hours per week
                 - target_duration_weeks: Target completion time
+            timeout: Optional per-call deadline in seconds
         
         Returns:
             Dictionary with roadmap structure
         """
-        prompt = self._create_roadmap_prompt(goal_data)
+        prompt = self.template.build(goal_data)
         
         try:
-            response = self.model.generate_content(prompt)
+            response = self.generate_response(prompt, timeout=timeout)
             roadmap_data = self._parse_response(response.text)
             return roadmap_data
         except Exception as e:
             raise Exception(f"Error generating roadmap: {str(e)}")
     
-    def _create_roadmap_prompt(self, goal_data: Dict) -> str:
-        """Create a structured prompt for Gemini"""
-        return f"""
-You are an expert learning advisor. Create a detailed, week-by-week learning roadmap for the following goal:
-
-**Goal Title:** {goal_data['title']}
-**Description:** {goal_data['description']}
-**Category:** {goal_data['category']}
-**Difficulty Level:** {goal_data['difficulty_level']}
-**Available Time:** {goal_data['hours_per_week']} hours per week
-**Target Duration:** {goal_data['target_duration_weeks']} weeks
-
-Please create a structured learning roadmap with the following:
-
-1. A brief summary (2-3 sentences) explaining the learning path
-2. Weekly milestones broken down by week number
-3. For each milestone, include:
-   - A clear title
-   - Description of what will be learned
-   - Estimated hours needed
-   - 3-5 specific learning resources (mix of free and paid)
-
-For each resource, provide:
-- Title
-- URL (use real, accessible resources like YouTube, Coursera, Udemy, freeCodeCamp, MDN, Khan Academy, etc.)
-- Type (video/article/course/book/practice)
-- Whether it's free or paid
-- Estimated duration
-
-Return your response in the following JSON format:
-{{
-  "summary": "Brief overview of the learning path",
-  "milestones": [
-    {{
-      "week_number": 1,
-      "title": "Milestone title",
-      "description": "What the learner will achieve",
-      "estimated_hours": 5,
-      "resources": [
-        {{
-          "title": "Resource title",
-          "url": "https://example.com",
-          "resource_type": "video",
-          "is_free": true,
-          "estimated_duration": "2 hours",
-          "description": "Brief description"
-        }}
-      ]
-    }}
-  ]
-}}
-
-Make sure the roadmap is realistic, progressive, and tailored to the {goal_data['difficulty_level']} level.
-"""
+    def generate_response(self, prompt: RoadmapPrompt, timeout: float = None):
+        """Send a built prompt and return the raw SDK response (text and usage_metadata)"""
+        request_options = {'timeout': timeout} if timeout else None
+        return self._model_for(prompt).generate_content(
+            prompt.request,
+            generation_config=prompt.generation_config,
+            request_options=request_options,
+        )
+    
+    def _model_for(self, prompt: RoadmapPrompt):
+        if not prompt.prefix:
+            return self.model
+        model = self._prefixed_models.get(prompt.prefix_key)
+        if model is None:
+            model = genai.GenerativeModel(self.model_name, system_instruction=prompt.prefix)
+            self._prefixed_models[prompt.prefix_key] = model
+        return model
     
     def _parse_response(self, response_text: str) -> Dict:
         """Parse Gemini's response into structured data"""
@@ -106,7 +78,7 @@ Make sure the roadmap is realistic, progressive, and tailored to the {goal_data[
                 clean_text = clean_text[:-3]
             
             clean_text = clean_text.strip()
-            roadmap_data = json.loads(clean_text)
+            roadmap_data = self.template.expand(json.loads(clean_text))
             
             # Validate structure
             if 'summary' not in roadmap_data or 'milestones' not in roadmap_data:
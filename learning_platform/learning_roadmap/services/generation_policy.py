@@ -0,0 +1,200 @@
+# learning_roadmap/services/generation_policy.py
+
+import bisect
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from django.conf import settings
+
+from .backends import get_backend
+
+
+class RoadmapGenerationError(Exception):
+    """Raised when every step of the fallback chain failed"""
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram.
+
+    Counts are halved every `window` observations so the percentiles follow
+    the provider's recent behaviour instead of its all-time average.
+    """
+
+    # Bucket upper bounds in seconds, roughly log-spaced
+    BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 3, 4, 5, 6, 8, 10, 12, 15, 20, 25, 30, 45, 60, 90, 120)
+
+    def __init__(self, buckets=None, window: int = 500):
+        self.buckets = tuple(buckets or self.BUCKETS)
+        self.window = window
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.total = 0
+        self._since_decay = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        idx = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            self.counts[idx] += 1
+            self.total += 1
+            self._since_decay += 1
+            if self._since_decay >= self.window:
+                self.counts = [count // 2 for count in self.counts]
+                self.total = sum(self.counts)
+                self._since_decay = 0
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Return the bucket upper bound containing the given percentile"""
+        with self._lock:
+            if self.total == 0:
+                return None
+            rank = pct / 100 * self.total
+            running = 0
+            for idx, count in enumerate(self.counts):
+                running += count
+                if running >= rank:
+                    return self.buckets[min(idx, len(self.buckets) - 1)]
+            return self.buckets[-1]
+
+
+class GenerationStep:
+    """One entry of the fallback chain: a generator plus its call policy"""
+
+    def __init__(self, name: str, generator, deadline: Optional[float] = None,
+                 hedge: bool = False, hedge_after: Optional[float] = None):
+        self.name = name
+        self.generator = generator
+        self.deadline = deadline
+        self.hedge = hedge
+        # Used as the hedge threshold until the histogram has enough samples
+        self.hedge_after = hedge_after
+        self.histogram = LatencyHistogram()
+
+
+class GenerationPolicy:
+    """
+    Runs roadmap generation through an ordered fallback chain.
+
+    Each step gets a per-call deadline. Hedged steps fire a second,
+    identical request once the first has been outstanding longer than the
+    step's observed latency percentile, and whichever returns first wins.
+    When a step returns or gives up, its requests that are still queued are
+    cancelled; ones already running can't be interrupted (the provider SDKs
+    are blocking) and finish in the background, bounded by the timeout
+    passed to the SDK. Steps with no deadline and no hedging (the local
+    template fallback) run inline, so they never queue behind slow calls.
+    """
+
+    def __init__(self, steps: List[GenerationStep], hedge_percentile: float = 95,
+                 min_samples: int = 20, max_workers: int = 8):
+        if not steps:
+            raise ValueError("Generation policy needs at least one step")
+        self.steps = steps
+        self.hedge_percentile = hedge_percentile
+        self.min_samples = min_samples
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='roadmap-gen')
+
+    def generate_roadmap(self, goal_data: Dict) -> Dict:
+        errors = []
+        for step in self.steps:
+            try:
+                return self._run_step(step, goal_data)
+            except Exception as e:
+                errors.append(f"{step.name}: {str(e)}")
+        raise RoadmapGenerationError("; ".join(errors))
+
+    def hedge_threshold(self, step: GenerationStep) -> Optional[float]:
+        """Seconds to wait before hedging, or None to never hedge"""
+        if not step.hedge:
+            return None
+        if step.histogram.total < self.min_samples:
+            return step.hedge_after
+        return step.histogram.percentile(self.hedge_percentile)
+
+    def _submit(self, step: GenerationStep, goal_data: Dict):
+        timing = {}
+
+        def call():
+            # Latency is measured from when a worker picks the call up, not from submit
+            timing['started'] = time.monotonic()
+            return step.generator.generate_roadmap(goal_data, timeout=step.deadline)
+
+        future = self._executor.submit(call)
+        future.timing = timing
+        return future
+
+    def _run_inline(self, step: GenerationStep, goal_data: Dict) -> Dict:
+        started = time.monotonic()
+        result = step.generator.generate_roadmap(goal_data, timeout=None)
+        step.histogram.observe(time.monotonic() - started)
+        return result
+
+    def _run_step(self, step: GenerationStep, goal_data: Dict) -> Dict:
+        hedge_at = self.hedge_threshold(step)
+        if step.deadline is None and hedge_at is None:
+            return self._run_inline(step, goal_data)
+
+        started = time.monotonic()
+        deadline = started + step.deadline if step.deadline else None
+        hedge_at = started + hedge_at if hedge_at is not None else None
+
+        pending = {self._submit(step, goal_data)}
+        launched = 1
+        last_error = None
+
+        try:
+            while pending:
+                now = time.monotonic()
+                wake_at = deadline
+                if launched == 1 and hedge_at is not None:
+                    wake_at = hedge_at if wake_at is None else min(wake_at, hedge_at)
+                timeout = None if wake_at is None else max(0, wake_at - now)
+
+                done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    if future.exception() is None:
+                        step.histogram.observe(time.monotonic() - future.timing['started'])
+                        return future.result()
+                    last_error = future.exception()
+
+                now = time.monotonic()
+                if deadline is not None and now >= deadline:
+                    # Record the censored sample so a stalling provider raises p95
+                    step.histogram.observe(step.deadline)
+                    raise TimeoutError(f"no response within {step.deadline}s")
+                if pending and launched == 1 and hedge_at is not None and now >= hedge_at:
+                    pending.add(self._submit(step, goal_data))
+                    launched += 1
+
+            raise last_error
+        finally:
+            # Drop calls that haven't started so they don't occupy workers later
+            for future in pending:
+                future.cancel()
+
+
+@lru_cache(maxsize=None)
+def get_generation_policy() -> GenerationPolicy:
+    """Build the process-wide policy from settings.ROADMAP_GENERATION"""
+    conf = getattr(settings, 'ROADMAP_GENERATION', {})
+    chain = conf.get('CHAIN') or [{'name': 'gemini', 'backend': 'gemini'}]
+    steps = [
+        GenerationStep(
+            name=spec.get('name', spec.get('backend', 'gemini')),
+            generator=get_backend(spec.get('backend', 'gemini'), **spec.get('options', {})),
+            deadline=spec.get('deadline'),
+            hedge=spec.get('hedge', False),
+            hedge_after=spec.get('hedge_after'),
+        )
+        for spec in chain
+    ]
+    return GenerationPolicy(
+        steps,
+        hedge_percentile=conf.get('HEDGE_PERCENTILE', 95),
+        min_samples=conf.get('MIN_SAMPLES', 20),
+        max_workers=conf.get('MAX_WORKERS', 8),
+    )
@@ -0,0 +1,253 @@
+# learning_roadmap/services/import_service.py
+
+import json
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.validators import URLValidator
+from django.db import transaction
+from django.utils.dateparse import parse_datetime
+
+from ..models import Category, LearningGoal, Roadmap, Milestone, Resource
+from .analytics_service import add_goals
+from .search_service import index_goals
+
+
+RESOURCE_TYPES = {choice for choice, _ in Resource.RESOURCE_TYPE_CHOICES}
+DIFFICULTY_LEVELS = {choice for choice, _ in LearningGoal.DIFFICULTY_CHOICES}
+CATEGORY_TYPES = {choice for choice, _ in Category.CATEGORY_CHOICES}
+
+_validate_url = URLValidator()
+
+
+def _is_type(value, kind) -> bool:
+    # bool is an int subclass; don't let true/false pass as numbers
+    return isinstance(value, kind) and (kind is bool or not isinstance(value, bool))
+
+
+def _require(data: Dict, key: str, kind, where: str):
+    if key not in data:
+        raise ValidationError(f"{where}: missing '{key}'")
+    value = data[key]
+    if not _is_type(value, kind):
+        raise ValidationError(f"{where}: '{key}' has the wrong type")
+    return value
+
+
+def _optional(data: Dict, key: str, kind, where: str):
+    value = data.get(key)
+    if key in data and not _is_type(value, kind):
+        raise ValidationError(f"{where}: '{key}' has the wrong type")
+    return value
+
+
+def _check_length(model, field: str, value: Optional[str], where: str, key: str = None):
+    max_length = model._meta.get_field(field).max_length
+    if value is not None and len(value) > max_length:
+        raise ValidationError(f"{where}: '{key or field}' is longer than {max_length} characters")
+
+
+def _check_completed_at(data: Dict, where: str):
+    # Exports write null for rows that were never completed
+    if data.get('completed_at') is None:
+        return
+    value = _optional(data, 'completed_at', str, where)
+    try:
+        parsed = parse_datetime(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValidationError(f"{where}: 'completed_at' is not an ISO 8601 datetime")
+
+
+def validate_record(record: Dict) -> Dict:
+    """
+    Check an import record against the roadmap schema.
+
+    Records are the goal-level JSON objects produced by export (extra keys
+    such as ids are ignored). `roadmap` uses the same summary/milestones/
+    resources structure the generators return. Every field the importer
+    writes is type- and length-checked here, so a bad record is reported
+    instead of failing halfway through a batch.
+    """
+    if not isinstance(record, dict):
+        raise ValidationError("record must be a JSON object")
+
+    _check_length(LearningGoal, 'title', _require(record, 'title', str, 'goal'), 'goal')
+    _check_length(Category, 'name', _require(record, 'category', str, 'goal'), 'goal', 'category')
+    if _optional(record, 'category_type', str, 'goal') not in CATEGORY_TYPES | {None}:
+        raise ValidationError(f"goal: unknown category_type '{record['category_type']}'")
+    _optional(record, 'description', str, 'goal')
+    if _require(record, 'difficulty_level', str, 'goal') not in DIFFICULTY_LEVELS:
+        raise ValidationError(f"goal: unknown difficulty_level '{record['difficulty_level']}'")
+    _require(record, 'hours_per_week', int, 'goal')
+    _require(record, 'target_duration_weeks', int, 'goal')
+
+    roadmap = _require(record, 'roadmap', dict, 'goal')
+    _require(roadmap, 'summary', str, 'roadmap')
+    milestones = _require(roadmap, 'milestones', list, 'roadmap')
+
+    for m_idx, milestone in enumerate(milestones, 1):
+        where = f"milestone {m_idx}"
+        if not isinstance(milestone, dict):
+            raise ValidationError(f"{where}: must be a JSON object")
+        _check_length(Milestone, 'title', _require(milestone, 'title', str, where), where)
+        _optional(milestone, 'description', str, where)
+        _require(milestone, 'week_number', int, where)
+        _optional(milestone, 'order', int, where)
+        _require(milestone, 'estimated_hours', (int, float), where)
+        _optional(milestone, 'is_completed', bool, where)
+        _check_completed_at(milestone, where)
+        for r_idx, resource in enumerate(_optional(milestone, 'resources', list, where) or [], 1):
+            where = f"milestone {m_idx} resource {r_idx}"
+            if not isinstance(resource, dict):
+                raise ValidationError(f"{where}: must be a JSON object")
+            _check_length(Resource, 'title', _require(resource, 'title', str, where), where)
+            url = _require(resource, 'url', str, where)
+            _check_length(Resource, 'url', url, where)
+            _validate_url(url)
+            if _require(resource, 'resource_type', str, where) not in RESOURCE_TYPES:
+                raise ValidationError(f"{where}: unknown resource_type '{resource['resource_type']}'")
+            _optional(resource, 'is_free', bool, where)
+            _check_length(Resource, 'estimated_duration',
+                          _optional(resource, 'estimated_duration', str, where), where)
+            _optional(resource, 'description', str, where)
+            _optional(resource, 'is_completed', bool, where)
+            _check_completed_at(resource, where)
+    return record
+
+
+def iter_jsonl_records(lines: Iterable[str], importer: Optional['RoadmapImporter'] = None
+                       ) -> Iterator[Tuple[int, Optional[Dict], Optional[str]]]:
+    """
+    Yield (line_number, record, error) for each non-blank line.
+
+    With an importer, each record's owner is resolved too, so an unknown
+    user is reported against its line like any other invalid record.
+    """
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            record = validate_record(json.loads(line))
+            if importer is not None:
+                importer.resolve_owner(record)
+            yield line_number, record, None
+        except json.JSONDecodeError as e:
+            yield line_number, None, f"invalid JSON: {e}"
+        except ValidationError as e:
+            yield line_number, None, '; '.join(e.messages)
+
+
+class RoadmapImporter:
+    """
+    Writes validated records with one bulk_create per model per batch.
+
+    Goals, roadmaps and milestones need their primary keys back to link
+    children, which bulk_create provides on SQLite 3.35+ and Postgres.
+    """
+
+    def __init__(self, user: Optional[User] = None, batch_size: int = 500, index: bool = True):
+        self.user = user
+        self.batch_size = batch_size
+        self.index = index
+        self._categories = {}
+        self._users = {}
+        self.counts = {'goals': 0, 'milestones': 0, 'resources': 0}
+
+    def import_records(self, records: Iterable[Dict]) -> Dict[str, int]:
+        batch = []
+        for record in records:
+            batch.append(record)
+            if len(batch) >= self.batch_size:
+                self._write_batch(batch)
+                batch = []
+        if batch:
+            self._write_batch(batch)
+        return self.counts
+
+    def _category(self, record: Dict) -> Category:
+        key = (record['category'], record.get('category_type', 'other'))
+        if key not in self._categories:
+            self._categories[key] = (
+                Category.objects.filter(name=key[0]).first()
+                or Category.objects.create(name=key[0], category_type=key[1])
+            )
+        return self._categories[key]
+
+    def resolve_owner(self, record: Dict) -> User:
+        """The user a record will be imported for; ValidationError if there is none"""
+        if self.user is not None:
+            return self.user
+        username = record.get('user')
+        if not username or not isinstance(username, str):
+            raise ValidationError("goal: no 'user' given and no importing user was set")
+        if username not in self._users:
+            self._users[username] = User.objects.filter(username=username).first()
+        if self._users[username] is None:
+            raise ValidationError(f"goal: user '{username}' does not exist")
+        return self._users[username]
+
+    @transaction.atomic
+    def _write_batch(self, records: List[Dict]):
+        goals = LearningGoal.objects.bulk_create([
+            LearningGoal(
+                user=self.resolve_owner(record),
+                category=self._category(record),
+                title=record['title'],
+                description=record.get('description', ''),
+                difficulty_level=record['difficulty_level'],
+                hours_per_week=record['hours_per_week'],
+                target_duration_weeks=record['target_duration_weeks'],
+            )
+            for record in records
+        ])
+        roadmaps = Roadmap.objects.bulk_create([
+            Roadmap(goal=goal, ai_summary=record['roadmap']['summary'])
+            for goal, record in zip(goals, records)
+        ])
+
+        milestone_data = [
+            (roadmap, idx, milestone)
+            for roadmap, record in zip(roadmaps, records)
+            for idx, milestone in enumerate(record['roadmap']['milestones'], 1)
+        ]
+        milestones = Milestone.objects.bulk_create([
+            Milestone(
+                roadmap=roadmap,
+                title=data['title'],
+                description=data.get('description', ''),
+                week_number=data['week_number'],
+                order=data.get('order', idx),
+                estimated_hours=data['estimated_hours'],
+                is_completed=data.get('is_completed', False),
+                completed_at=parse_datetime(data['completed_at']) if data.get('completed_at') else None,
+            )
+            for roadmap, idx, data in milestone_data
+        ], batch_size=self.batch_size)
+
+        resources = Resource.objects.bulk_create([
+            Resource(
+                milestone=milestone,
+                title=data['title'],
+                url=data['url'],
+                resource_type=data['resource_type'],
+                is_free=data.get('is_free', True),
+                estimated_duration=data.get('estimated_duration', ''),
+                description=data.get('description', ''),
+                is_completed=data.get('is_completed', False),
+                completed_at=parse_datetime(data['completed_at']) if data.get('completed_at') else None,
+            )
+            for milestone, (_, _, milestone_json) in zip(milestones, milestone_data)
+            for data in milestone_json.get('resources', [])
+        ], batch_size=self.batch_size)
+
+        # bulk_create skips post_save, so index the new rows explicitly
+        if self.index:
+            index_goals([goal.pk for goal in goals])
+        add_goals([goal.pk for goal in goals])
+
+        self.counts['goals'] += len(goals)
+        self.counts['milestones'] += len(milestones)
+        self.counts['resources'] += len(resources)
@@ -0,0 +1,188 @@
+# learning_roadmap/services/link_checker.py
+
+import asyncio
+import threading
+import time
+from datetime import timedelta
+from typing import Iterable, List, NamedTuple, Optional
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+from ..models import LinkStatus
+
+
+class LinkResult(NamedTuple):
+    url: str
+    status: str
+    http_status: Optional[int]
+    error: str
+    response_ms: int
+
+
+def get_link_checker_settings():
+    conf = {
+        'CONCURRENCY': 100,
+        'PER_HOST': 8,
+        'TIMEOUT': 10,
+        'MAX_AGE_HOURS': 24,
+        'BATCH_SIZE': 5000,
+        'CHECK_ON_CREATE': True,
+    }
+    conf.update(getattr(settings, 'LINK_CHECKER', {}))
+    return conf
+
+
+class LinkChecker:
+    """
+    Bulk URL health checker built on aiohttp.
+
+    One pooled session is shared by a fixed number of workers; the connector
+    caps connections overall and per host so a roadmap full of YouTube links
+    doesn't hammer a single site. Each URL gets a HEAD request, falling back
+    to GET when the server rejects or mishandles HEAD.
+    """
+
+    # HEAD responses that say nothing reliable about the resource itself
+    HEAD_FALLBACK_STATUSES = {400, 403, 405, 406, 429, 500, 501, 503}
+    USER_AGENT = 'Mozilla/5.0 (compatible; LearningRoadmapLinkChecker/1.0)'
+
+    def __init__(self, concurrency: int = None, per_host: int = None, timeout: float = None):
+        conf = get_link_checker_settings()
+        self.concurrency = concurrency or conf['CONCURRENCY']
+        self.per_host = per_host or conf['PER_HOST']
+        self.timeout = timeout or conf['TIMEOUT']
+
+    def check(self, urls: Iterable[str]) -> List[LinkResult]:
+        """Synchronous entry point for views and management commands"""
+        return asyncio.run(self.check_all(list(urls)))
+
+    async def check_all(self, urls: List[str]) -> List[LinkResult]:
+        import aiohttp
+
+        connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.per_host, ttl_dns_cache=300)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        results = [None] * len(urls)
+        queue = iter(enumerate(urls))
+
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                         headers={'User-Agent': self.USER_AGENT}) as session:
+            async def worker():
+                for idx, url in queue:
+                    results[idx] = await self._check_one(session, url)
+
+            await asyncio.gather(*(worker() for _ in range(min(self.concurrency, len(urls)) or 1)))
+
+        return results
+
+    async def _check_one(self, session, url: str) -> LinkResult:
+        import aiohttp
+
+        started = time.monotonic()
+        try:
+            try:
+                async with session.head(url, allow_redirects=True) as response:
+                    http_status = response.status
+            except (asyncio.TimeoutError, aiohttp.ClientConnectorError):
+                raise
+            except aiohttp.ClientError:
+                # Some servers drop the connection on HEAD instead of answering
+                http_status = None
+            if http_status is None or http_status in self.HEAD_FALLBACK_STATUSES:
+                async with session.get(url, allow_redirects=True) as response:
+                    http_status = response.status
+        except asyncio.TimeoutError:
+            return LinkResult(url, 'error', None, 'Timed out', self._elapsed_ms(started))
+        except (aiohttp.ClientError, ValueError) as e:
+            return LinkResult(url, 'error', None, str(e)[:300] or e.__class__.__name__, self._elapsed_ms(started))
+
+        return LinkResult(url, self._classify(http_status), http_status, '', self._elapsed_ms(started))
+
+    @staticmethod
+    def _classify(http_status: int) -> str:
+        if http_status < 400:
+            return 'ok'
+        # Rate limiting and server errors are usually transient
+        if http_status == 429 or http_status >= 500:
+            return 'error'
+        return 'broken'
+
+    @staticmethod
+    def _elapsed_ms(started: float) -> int:
+        return int((time.monotonic() - started) * 1000)
+
+
+def stale_urls(urls: Iterable[str], max_age: Optional[timedelta]) -> List[str]:
+    """Drop URLs that were checked within max_age"""
+    urls = list(dict.fromkeys(urls))
+    if max_age is None:
+        return urls
+
+    cutoff = timezone.now() - max_age
+    fresh = set()
+    # Chunk the IN clause to stay under SQLite's bound-parameter limit
+    for start in range(0, len(urls), 500):
+        fresh.update(
+            LinkStatus.objects.filter(url__in=urls[start:start + 500], last_checked_at__gte=cutoff)
+            .values_list('url', flat=True)
+        )
+    return [url for url in urls if url not in fresh]
+
+
+def store_results(results: Iterable[LinkResult]):
+    now = timezone.now()
+    LinkStatus.objects.bulk_create(
+        [
+            LinkStatus(url=r.url, status=r.status, http_status=r.http_status,
+                       error=r.error, response_ms=r.response_ms, last_checked_at=now)
+            for r in results
+        ],
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=['url'],
+        update_fields=['status', 'http_status', 'error', 'response_ms', 'last_checked_at'],
+    )
+
+
+def refresh_link_statuses(urls: Iterable[str], max_age: Optional[timedelta] = None,
+                          checker: LinkChecker = None) -> int:
+    """
+    Check every URL not checked within max_age and upsert its LinkStatus.
+
+    Returns the number of URLs checked.
+    """
+    conf = get_link_checker_settings()
+    checker = checker or LinkChecker()
+    pending = stale_urls(urls, max_age)
+
+    for start in range(0, len(pending), conf['BATCH_SIZE']):
+        store_results(checker.check(pending[start:start + conf['BATCH_SIZE']]))
+    return len(pending)
+
+
+def _refresh_in_background(urls: List[str], max_age: Optional[timedelta]):
+    def run():
+        try:
+            refresh_link_statuses(urls, max_age=max_age)
+        finally:
+            close_old_connections()
+
+    threading.Thread(target=run, name='link-check', daemon=True).start()
+
+
+def schedule_link_check(urls: Iterable[str]):
+    """Check freshly materialized resource URLs without blocking the request"""
+    conf = get_link_checker_settings()
+    urls = list(urls)
+    if not conf['CHECK_ON_CREATE'] or not urls:
+        return
+    _refresh_in_background(urls, timedelta(hours=conf['MAX_AGE_HOURS']))
+
+
+def schedule_link_recheck(urls: Iterable[str]) -> int:
+    """Re-check URLs regardless of age without blocking the request; returns how many were queued"""
+    urls = list(dict.fromkeys(urls))
+    if urls:
+        _refresh_in_background(urls, None)
+    return len(urls)
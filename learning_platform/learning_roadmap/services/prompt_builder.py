@@ -0,0 +1,313 @@
+# learning_roadmap/services/prompt_builder.py
+
+import json
+import math
+from typing import Dict, NamedTuple, Optional, Tuple
+
+
+DEFAULT_PROMPT_VERSION = 'v2'
+
+CATEGORY_TYPES = ('coding', 'language', 'fitness', 'other')
+DIFFICULTY_LEVELS = ('beginner', 'intermediate', 'advanced')
+
+
+class RoadmapPrompt(NamedTuple):
+    version: str
+    # (version, category_type, difficulty); None when the template has no static prefix
+    prefix_key: Optional[Tuple[str, str, str]]
+    # Instructions shared by every goal with the same prefix_key, sent first
+    # (as the system instruction) so the provider can reuse its cached prefix
+    prefix: str
+    # The goal-specific part of the prompt
+    request: str
+    generation_config: Optional[Dict]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token), for budgets and offline benchmarks"""
+    return math.ceil(len(text) / 4)
+
+
+class LegacyPromptTemplate:
+    """
+    The original single-string prompt: full instruction block and JSON example
+    on every call, 3-5 resources and prose descriptions per milestone.
+
+    Kept as a version so it can be benchmarked against, and selected again
+    with the backend's prompt_version option.
+    """
+
+    version = 'v1'
+
+    def build(self, goal_data: Dict) -> RoadmapPrompt:
+        request = f"""
+You are an expert learning advisor. Create a detailed, week-by-week learning roadmap for the following goal:
+
+**Goal Title:** {goal_data['title']}
+**Description:** {goal_data['description']}
+**Category:** {goal_data['category']}
+**Difficulty Level:** {goal_data['difficulty_level']}
+**Available Time:** {goal_data['hours_per_week']} hours per week
+**Target Duration:** {goal_data['target_duration_weeks']} weeks
+
+Please create a structured learning roadmap with the following:
+
+1. A brief summary (2-3 sentences) explaining the learning path
+2. Weekly milestones broken down by week number
+3. For each milestone, include:
+   - A clear title
+   - Description of what will be learned
+   - Estimated hours needed
+   - 3-5 specific learning resources (mix of free and paid)
+
+For each resource, provide:
+- Title
+- URL (use real, accessible resources like YouTube, Coursera, Udemy, freeCodeCamp, MDN, Khan Academy, etc.)
+- Type (video/article/course/book/practice)
+- Whether it's free or paid
+- Estimated duration
+
+Return your response in the following JSON format:
+{{
+  "summary": "Brief overview of the learning path",
+  "milestones": [
+    {{
+      "week_number": 1,
+      "title": "Milestone title",
+      "description": "What the learner will achieve",
+      "estimated_hours": 5,
+      "resources": [
+        {{
+          "title": "Resource title",
+          "url": "https://example.com",
+          "resource_type": "video",
+          "is_free": true,
+          "estimated_duration": "2 hours",
+          "description": "Brief description"
+        }}
+      ]
+    }}
+  ]
+}}
+
+Make sure the roadmap is realistic, progressive, and tailored to the {goal_data['difficulty_level']} level.
+"""
+        return RoadmapPrompt(self.version, None, '', request, None)
+
+    def resources_per_milestone(self, weeks: int) -> int:
+        return 4
+
+    def expand(self, data: Dict) -> Dict:
+        return data
+
+    def render(self, roadmap_data: Dict, weeks: int) -> str:
+        """Serialize a roadmap the way this version asks the model to answer"""
+        return json.dumps(roadmap_data, indent=2)
+
+
+class LeanPromptTemplate:
+    """
+    Static, precompiled instruction prefixes plus a compact output schema.
+
+    Everything that doesn't depend on the goal itself lives in a prefix
+    built once per (category type, difficulty); the goal fields and the
+    size limits follow it. The model answers with single-letter keys, and
+    longer plans get fewer resources and shorter (or no) descriptions, so
+    output size grows slowly with target_duration_weeks. expand() turns
+    the answer back into the structure the rest of the app uses.
+    """
+
+    version = 'v2'
+
+    CATEGORY_GUIDANCE = {
+        'coding': (
+            "Favour official documentation, freeCodeCamp, MDN, The Odin Project and well-known YouTube "
+            "channels. Every few weeks include a small project that uses everything learned so far."
+        ),
+        'language': (
+            "Balance listening, speaking, reading and writing each week. Favour graded readers, podcasts, "
+            "spaced-repetition decks and conversation practice over grammar-only material."
+        ),
+        'fitness': (
+            "Progress load gradually, include a lighter recovery week every 4-6 weeks, and prefer video "
+            "demonstrations of technique from qualified coaches. Do not give medical advice."
+        ),
+        'other': (
+            "Favour reputable free material (Khan Academy, university open courseware, established "
+            "YouTube educators) and include regular practice or review."
+        ),
+    }
+
+    DIFFICULTY_GUIDANCE = {
+        'beginner': "Assume no prior knowledge. Introduce one idea at a time and revisit it before moving on.",
+        'intermediate': "Assume the basics are known. Focus on depth, common patterns and realistic practice.",
+        'advanced': "Assume solid experience. Focus on edge cases, performance, design trade-offs and mastery.",
+    }
+
+    # (up to this many weeks, resources per milestone, milestone description words; 0 = no description)
+    OUTPUT_TIERS = [
+        (4, 3, 20),
+        (12, 2, 12),
+        (None, 2, 0),
+    ]
+
+    RESOURCE_TYPE_CODES = {
+        'v': 'video',
+        'a': 'article',
+        'c': 'course',
+        'b': 'book',
+        'p': 'practice',
+        'o': 'other',
+    }
+
+    # Estimated output tokens per element of the lean answer
+    SUMMARY_TOKENS = 80
+    MILESTONE_TOKENS = 30
+    RESOURCE_TOKENS = 50
+    TOKENS_PER_WORD = 1.4
+    BUDGET_HEADROOM = 1.3
+    MIN_OUTPUT_TOKENS = 1024
+    MAX_OUTPUT_TOKENS = 8192
+
+    def __init__(self):
+        self._type_letters = {name: code for code, name in self.RESOURCE_TYPE_CODES.items()}
+        self.prefixes = {
+            (category_type, difficulty): self._compile_prefix(category_type, difficulty)
+            for category_type in CATEGORY_TYPES
+            for difficulty in DIFFICULTY_LEVELS
+        }
+
+    def _compile_prefix(self, category_type: str, difficulty: str) -> str:
+        type_codes = ', '.join(f"{code}={name}" for code, name in self.RESOURCE_TYPE_CODES.items())
+        return f"""You are an expert learning advisor who writes week-by-week learning roadmaps.
+Prompt version: {self.version}. Category type: {category_type}. Level: {difficulty}.
+
+{self.CATEGORY_GUIDANCE[category_type]}
+{self.DIFFICULTY_GUIDANCE[difficulty]}
+
+Rules:
+- One milestone per week, week numbers 1..N with no gaps, each building on the previous one.
+- Estimated hours per milestone must fit the learner's weekly hours.
+- Resources must be real, currently available pages (official docs, YouTube, Coursera, Udemy, freeCodeCamp, MDN, Khan Academy and similar). Prefer free ones.
+- Use exactly the number of resources per milestone and the description length given with the goal.
+- Keep titles short (under 8 words). No text outside the JSON.
+
+Answer with compact JSON using these keys:
+{{"s": "2-sentence summary", "m": [{{"w": week number, "t": "milestone title", "d": "description (omit when the goal says none)", "h": estimated hours, "r": [{{"t": "resource title", "u": "url", "k": "type code", "f": 1 if free else 0, "l": "duration, e.g. 2h"}}]}}]}}
+Type codes: {type_codes}.
+"""
+
+    def _prefix(self, category_type: str, difficulty: str) -> str:
+        return self.prefixes.get((category_type, difficulty)) or self._compile_prefix(category_type, difficulty)
+
+    def output_plan(self, weeks: int) -> Tuple[int, int]:
+        """(resources per milestone, description words) for a plan of this length"""
+        for max_weeks, resources, description_words in self.OUTPUT_TIERS:
+            if max_weeks is None or weeks <= max_weeks:
+                return resources, description_words
+
+    def resources_per_milestone(self, weeks: int) -> int:
+        return self.output_plan(weeks)[0]
+
+    def output_budget(self, weeks: int) -> int:
+        """max_output_tokens for a plan of this length, with headroom over the expected size"""
+        resources, description_words = self.output_plan(weeks)
+        per_week = self.MILESTONE_TOKENS + resources * self.RESOURCE_TOKENS + description_words * self.TOKENS_PER_WORD
+        expected = self.SUMMARY_TOKENS + weeks * per_week
+        return int(min(self.MAX_OUTPUT_TOKENS, max(self.MIN_OUTPUT_TOKENS, expected * self.BUDGET_HEADROOM)))
+
+    def build(self, goal_data: Dict) -> RoadmapPrompt:
+        category_type = goal_data.get('category_type')
+        if category_type not in self.CATEGORY_GUIDANCE:
+            category_type = 'other'
+        difficulty = goal_data['difficulty_level']
+        weeks = max(1, int(goal_data['target_duration_weeks']))
+        resources, description_words = self.output_plan(weeks)
+
+        if description_words:
+            description_rule = f"at most {description_words} words"
+        else:
+            description_rule = 'none (omit "d")'
+        request = (
+            f"Goal: {goal_data['title']}\n"
+            f"Details: {goal_data['description']}\n"
+            f"Category: {goal_data['category']}\n"
+            f"Hours per week: {goal_data['hours_per_week']}\n"
+            f"Weeks: {weeks}\n"
+            f"Resources per milestone: {resources}\n"
+            f"Milestone description: {description_rule}\n"
+        )
+        return RoadmapPrompt(
+            version=self.version,
+            prefix_key=(self.version, category_type, difficulty),
+            prefix=self._prefix(category_type, difficulty),
+            request=request,
+            generation_config={
+                'max_output_tokens': self.output_budget(weeks),
+                'response_mime_type': 'application/json',
+            },
+        )
+
+    def expand(self, data: Dict) -> Dict:
+        """Turn a lean answer into the summary/milestones/resources structure"""
+        try:
+            return {
+                'summary': data['s'],
+                'milestones': [
+                    {
+                        'week_number': int(milestone['w']),
+                        'title': milestone['t'],
+                        'description': milestone.get('d', ''),
+                        'estimated_hours': float(milestone['h']),
+                        'resources': [
+                            {
+                                'title': resource['t'],
+                                'url': resource['u'],
+                                'resource_type': self.RESOURCE_TYPE_CODES.get(resource.get('k'), 'other'),
+                                'is_free': bool(int(resource.get('f', 1))),
+                                'estimated_duration': resource.get('l', ''),
+                                'description': '',
+                            }
+                            for resource in milestone.get('r', [])
+                        ],
+                    }
+                    for milestone in data['m']
+                ],
+            }
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid roadmap structure: {e}")
+
+    def render(self, roadmap_data: Dict, weeks: int) -> str:
+        """Serialize a roadmap the way this version asks the model to answer"""
+        resources, description_words = self.output_plan(weeks)
+        milestones = []
+        for milestone in roadmap_data['milestones']:
+            lean = {'w': milestone['week_number'], 't': milestone['title'], 'h': milestone['estimated_hours']}
+            if description_words:
+                lean['d'] = ' '.join(milestone['description'].split()[:description_words])
+            lean['r'] = [
+                {
+                    't': resource['title'],
+                    'u': resource['url'],
+                    'k': self._type_letters.get(resource['resource_type'], 'o'),
+                    'f': int(resource['is_free']),
+                    'l': resource['estimated_duration'],
+                }
+                for resource in milestone['resources'][:resources]
+            ]
+            milestones.append(lean)
+        return json.dumps({'s': roadmap_data['summary'], 'm': milestones}, separators=(',', ':'))
+
+
+PROMPT_TEMPLATES = {
+    template.version: template
+    for template in (LegacyPromptTemplate(), LeanPromptTemplate())
+}
+
+
+def get_prompt_template(version: str = None):
+    version = version or DEFAULT_PROMPT_VERSION
+    try:
+        return PROMPT_TEMPLATES[version]
+    except KeyError:
+        raise ValueError(f"Unknown prompt version '{version}'; expected one of {sorted(PROMPT_TEMPLATES)}")
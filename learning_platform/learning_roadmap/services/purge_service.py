@@ -0,0 +1,170 @@
+# learning_roadmap/services/purge_service.py
+
+import threading
+import time
+from functools import partial
+from typing import Dict
+
+from django.conf import settings
+from django.db import close_old_connections, router, transaction
+from django.db.models import signals
+from django.utils import timezone
+
+from ..models import LearningGoal, Roadmap, Milestone, Resource, Progress, GoalStats
+from ..signals import PURGE_SKIPPABLE_RECEIVERS
+from .analytics_service import remove_goals
+from .search_service import remove_documents
+
+
+_purge_lock = threading.Lock()
+_listener_check_lock = threading.Lock()
+
+
+def get_purge_settings():
+    conf = {
+        'BATCH_SIZE': 1000,
+        'THROTTLE_SECONDS': 0.05,
+        'GOALS_PER_PASS': 50,
+        'PURGE_ON_DELETE': True,
+    }
+    conf.update(getattr(settings, 'GOAL_PURGE', {}))
+    return conf
+
+
+def _has_delete_listeners(model) -> bool:
+    """
+    Whether deleting model rows must go through the collector so signals fire.
+
+    The app's own search-index receivers don't count: the purge removes
+    those documents itself, in batches. They are disconnected by
+    dispatch_uid just long enough to ask the signals whether anything
+    else is listening, then reconnected.
+    """
+    with _listener_check_lock:
+        disconnected = [
+            (signal, receiver, dispatch_uid)
+            for signal, sender, receiver, dispatch_uid in PURGE_SKIPPABLE_RECEIVERS
+            if sender is model and signal.disconnect(sender=model, dispatch_uid=dispatch_uid)
+        ]
+        try:
+            return signals.pre_delete.has_listeners(model) or signals.post_delete.has_listeners(model)
+        finally:
+            for signal, receiver, dispatch_uid in disconnected:
+                signal.connect(receiver, sender=model, dispatch_uid=dispatch_uid)
+
+
+def _batched_delete(queryset, batch_size: int, throttle: float, on_batch=None) -> int:
+    """
+    Delete the rows of queryset in primary-key batches.
+
+    Children are always purged before their parents, so by the time a batch
+    is deleted nothing references it and the cascade collector has nothing to
+    do. Batches are deleted with a single raw DELETE unless the model has
+    delete signal listeners, in which case the collector is used so they fire.
+    Each batch commits on its own, keeping SQLite's write lock short.
+    on_batch, if given, is called with each batch's primary keys.
+    """
+    model = queryset.model
+    using = router.db_for_write(model)
+    use_collector = _has_delete_listeners(model)
+    deleted = 0
+
+    while True:
+        pks = list(queryset.values_list('pk', flat=True)[:batch_size])
+        if not pks:
+            return deleted
+        batch = model._base_manager.using(using).filter(pk__in=pks)
+        if use_collector:
+            batch.delete()
+        else:
+            batch._raw_delete(using)
+        if on_batch:
+            on_batch(pks)
+        deleted += len(pks)
+        if throttle:
+            time.sleep(throttle)
+
+
+def delete_roadmap_contents(roadmap_ids, batch_size: int = None, throttle: float = None) -> Dict[str, int]:
+    """
+    Remove the milestones, resources and progress of the given roadmaps,
+    leaving the roadmaps themselves in place.
+
+    Returns the number of rows deleted per model.
+    """
+    conf = get_purge_settings()
+    batch_size = batch_size or conf['BATCH_SIZE']
+    throttle = conf['THROTTLE_SECONDS'] if throttle is None else throttle
+
+    return {
+        'progress': _batched_delete(
+            Progress.objects.filter(milestone__roadmap_id__in=roadmap_ids), batch_size, throttle),
+        'resources': _batched_delete(
+            Resource.objects.filter(milestone__roadmap_id__in=roadmap_ids), batch_size, throttle,
+            on_batch=partial(remove_documents, 'resource')),
+        'milestones': _batched_delete(
+            Milestone.objects.filter(roadmap_id__in=roadmap_ids), batch_size, throttle,
+            on_batch=partial(remove_documents, 'milestone')),
+    }
+
+
+def purge_deleted_goals(batch_size: int = None, throttle: float = None, max_goals: int = None) -> Dict[str, int]:
+    """
+    Remove tombstoned goals and everything hanging off them.
+
+    Returns the number of rows deleted per model.
+    """
+    conf = get_purge_settings()
+    batch_size = batch_size or conf['BATCH_SIZE']
+    throttle = conf['THROTTLE_SECONDS'] if throttle is None else throttle
+    counts = {'goals': 0, 'roadmaps': 0, 'milestones': 0, 'resources': 0, 'progress': 0}
+
+    while max_goals is None or counts['goals'] < max_goals:
+        limit = conf['GOALS_PER_PASS']
+        if max_goals is not None:
+            limit = min(limit, max_goals - counts['goals'])
+        goal_ids = list(
+            LearningGoal.objects.filter(deleted_at__isnull=False)
+            .order_by('deleted_at').values_list('id', flat=True)[:limit]
+        )
+        if not goal_ids:
+            break
+
+        roadmap_ids = list(Roadmap.objects.filter(goal_id__in=goal_ids).values_list('id', flat=True))
+        for name, count in delete_roadmap_contents(roadmap_ids, batch_size, throttle).items():
+            counts[name] += count
+        # Normally dropped at soft-delete time; a rebuild racing the delete can leave one behind
+        GoalStats.objects.filter(goal_id__in=goal_ids).delete()
+        counts['roadmaps'] += _batched_delete(
+            Roadmap.objects.filter(id__in=roadmap_ids), batch_size, throttle)
+        counts['goals'] += _batched_delete(
+            LearningGoal.objects.filter(id__in=goal_ids), batch_size, throttle,
+            on_batch=partial(remove_documents, 'goal'))
+
+    return counts
+
+
+def schedule_purge():
+    """Purge tombstoned goals in a background thread"""
+    if not get_purge_settings()['PURGE_ON_DELETE']:
+        return
+
+    def run():
+        # A purge already in progress will pick up the new tombstones
+        if not _purge_lock.acquire(blocking=False):
+            return
+        try:
+            purge_deleted_goals()
+        finally:
+            _purge_lock.release()
+            close_old_connections()
+
+    threading.Thread(target=run, name='goal-purge', daemon=True).start()
+
+
+def soft_delete_goals(queryset) -> int:
+    """Tombstone every goal in queryset with a single UPDATE"""
+    queryset = queryset.filter(deleted_at__isnull=True)
+    with transaction.atomic():
+        remove_goals(queryset.values_list('id', flat=True))
+        return queryset.update(is_active=False, deleted_at=timezone.now())
@@ -0,0 +1,98 @@
+# learning_roadmap/services/roadmap_service.py
+
+import logging
+import threading
+from typing import Dict, Iterable, List
+
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from ..models import LearningGoal, Roadmap, Milestone, Resource
+from .analytics_service import add_goals, remove_goals
+from .generation_policy import get_generation_policy
+from .link_checker import schedule_link_check
+from .purge_service import delete_roadmap_contents
+
+
+logger = logging.getLogger(__name__)
+
+
+def goal_prompt_data(goal: LearningGoal) -> Dict:
+    """The goal fields the generators work from"""
+    return {
+        'title': goal.title,
+        'description': goal.description,
+        'category': goal.category.name,
+        'category_type': goal.category.category_type,
+        'difficulty_level': goal.difficulty_level,
+        'hours_per_week': goal.hours_per_week,
+        'target_duration_weeks': goal.target_duration_weeks
+    }
+
+
+def materialize_roadmap(roadmap: Roadmap, roadmap_data: Dict) -> List[str]:
+    """
+    Create the milestones and resources described by roadmap_data.
+
+    Returns the resource URLs so the caller can schedule link checks.
+    """
+    resource_urls = []
+    for idx, milestone_data in enumerate(roadmap_data['milestones'], 1):
+        milestone = Milestone.objects.create(
+            roadmap=roadmap,
+            title=milestone_data['title'],
+            description=milestone_data['description'],
+            week_number=milestone_data['week_number'],
+            order=idx,
+            estimated_hours=milestone_data['estimated_hours']
+        )
+
+        for resource_data in milestone_data.get('resources', []):
+            Resource.objects.create(
+                milestone=milestone,
+                title=resource_data['title'],
+                url=resource_data['url'],
+                resource_type=resource_data['resource_type'],
+                is_free=resource_data['is_free'],
+                estimated_duration=resource_data.get('estimated_duration', ''),
+                description=resource_data.get('description', '')
+            )
+            resource_urls.append(resource_data['url'])
+    return resource_urls
+
+
+def regenerate_roadmap(goal: LearningGoal) -> Roadmap:
+    """Replace a goal's roadmap with a freshly generated one, keeping the Roadmap row"""
+    roadmap_data = get_generation_policy().generate_roadmap(goal_prompt_data(goal))
+
+    with transaction.atomic():
+        roadmap, _ = Roadmap.objects.get_or_create(goal=goal, defaults={'ai_summary': roadmap_data['summary']})
+        remove_goals([goal.id])
+        delete_roadmap_contents([roadmap.id], throttle=0)
+        roadmap.ai_summary = roadmap_data['summary']
+        roadmap.generated_at = timezone.now()
+        roadmap.save(update_fields=['ai_summary', 'generated_at'])
+        resource_urls = materialize_roadmap(roadmap, roadmap_data)
+        add_goals([goal.id])
+
+    schedule_link_check(resource_urls)
+    return roadmap
+
+
+def schedule_regeneration(goal_ids: Iterable[int]):
+    """Regenerate roadmaps one goal at a time in a background thread"""
+    goal_ids = list(goal_ids)
+    if not goal_ids:
+        return
+
+    def run():
+        try:
+            for goal in LearningGoal.objects.filter(id__in=goal_ids, deleted_at__isnull=True).select_related('category'):
+                try:
+                    regenerate_roadmap(goal)
+                except Exception:
+                    logger.exception("Failed to regenerate roadmap for goal %s", goal.pk)
+        finally:
+            close_old_connections()
+
+    threading.Thread(target=run, name='roadmap-regenerate', daemon=True).start()
@@ -0,0 +1,254 @@
+# learning_roadmap/services/search_service.py
+
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.db import connection
+from django.utils.html import escape
+
+from ..models import LearningGoal, Milestone, Resource
+
+
+FTS_TABLE = 'learning_roadmap_search_fts'
+PG_TABLE = 'learning_roadmap_search_pg'
+
+# Each indexed object gets a stable rowid derived from its kind and primary
+# key, so updates and deletes are point lookups instead of table scans.
+KINDS = {'goal': 1, 'milestone': 2, 'resource': 3}
+KIND_NAMES = {code: name for name, code in KINDS.items()}
+
+# Private-use sentinels passed to snippet()/ts_headline() and swapped for
+# <mark> after the text has been HTML-escaped
+MARK_START, MARK_END = '\ue000', '\ue001'
+
+# A document row: (rowid, goal_id, user_id, title, body)
+Document = Tuple[int, int, int, str, str]
+
+
+def make_rowid(kind: str, pk: int) -> int:
+    return pk * 4 + KINDS[kind]
+
+
+def split_rowid(rowid: int) -> Tuple[str, int]:
+    return KIND_NAMES[rowid % 4], rowid // 4
+
+
+def highlight(text: str) -> str:
+    """HTML-escape a snippet and turn the match sentinels into <mark> tags"""
+    return escape(text).replace(MARK_START, '<mark>').replace(MARK_END, '</mark>')
+
+
+class SQLiteSearchIndex:
+    """
+    FTS5 index. The owner column holds a `u<user_id>` token so scoping a
+    query to one user is part of the MATCH expression rather than a filter
+    over every matching row. The goal's current owner is checked as well,
+    since milestone and resource documents keep the owner they were
+    indexed with until they are re-indexed.
+    """
+
+    def upsert(self, cursor, documents: List[Document]):
+        cursor.executemany(
+            f"INSERT OR REPLACE INTO {FTS_TABLE} (rowid, title, body, owner, goal_id) VALUES (%s, %s, %s, %s, %s)",
+            [(rowid, title, body, f'u{user_id}', goal_id) for rowid, goal_id, user_id, title, body in documents],
+        )
+
+    def delete(self, cursor, rowids: List[int]):
+        cursor.executemany(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [(rowid,) for rowid in rowids])
+
+    def clear(self, cursor):
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+
+    def optimize(self, cursor):
+        cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')")
+
+    def search(self, cursor, user_id: int, terms: List[str], limit: int):
+        phrases = ' '.join('"' + term.replace('"', '""') + '"' for term in terms[:-1])
+        last = '"' + terms[-1].replace('"', '""') + '"*'
+        match = f'owner:u{user_id} AND {{title body}}: ({phrases} {last})'
+        cursor.execute(
+            f"""
+            SELECT s.rowid, s.goal_id,
+                   snippet({FTS_TABLE}, 0, %s, %s, '…', 12),
+                   snippet({FTS_TABLE}, 1, %s, %s, '…', 24),
+                   bm25({FTS_TABLE}, 5.0, 1.0)
+            FROM {FTS_TABLE} AS s
+            JOIN learning_roadmap_learninggoal AS g ON g.id = s.goal_id
+            WHERE {FTS_TABLE} MATCH %s AND g.deleted_at IS NULL AND g.user_id = %s
+            ORDER BY bm25({FTS_TABLE}, 5.0, 1.0)
+            LIMIT %s
+            """,
+            [MARK_START, MARK_END, MARK_START, MARK_END, match, user_id, limit],
+        )
+        # bm25() is lower-is-better; flip it so higher scores rank first
+        return [(rowid, goal_id, title, body, -rank) for rowid, goal_id, title, body, rank in cursor.fetchall()]
+
+
+class PostgresSearchIndex:
+    """tsvector index with a stored, weighted document column and a GIN index"""
+
+    def upsert(self, cursor, documents: List[Document]):
+        cursor.executemany(
+            f"""
+            INSERT INTO {PG_TABLE} (id, goal_id, user_id, title, body) VALUES (%s, %s, %s, %s, %s)
+            ON CONFLICT (id) DO UPDATE SET title = EXCLUDED.title, body = EXCLUDED.body
+            """,
+            documents,
+        )
+
+    def delete(self, cursor, rowids: List[int]):
+        cursor.execute(f"DELETE FROM {PG_TABLE} WHERE id = ANY(%s)", [list(rowids)])
+
+    def clear(self, cursor):
+        cursor.execute(f"TRUNCATE {PG_TABLE}")
+
+    def optimize(self, cursor):
+        cursor.execute(f"VACUUM ANALYZE {PG_TABLE}")
+
+    def search(self, cursor, user_id: int, terms: List[str], limit: int):
+        query = ' & '.join(terms) + ':*'
+        options = f'StartSel={MARK_START}, StopSel={MARK_END}, MaxWords=24, MinWords=8'
+        cursor.execute(
+            f"""
+            SELECT s.id, s.goal_id,
+                   ts_headline('english', s.title, q, %s),
+                   ts_headline('english', s.body, q, %s),
+                   ts_rank(s.document, q)
+            FROM {PG_TABLE} AS s
+            JOIN learning_roadmap_learninggoal AS g ON g.id = s.goal_id,
+                 to_tsquery('english', %s) AS q
+            WHERE s.user_id = %s AND s.document @@ q AND g.deleted_at IS NULL AND g.user_id = %s
+            ORDER BY ts_rank(s.document, q) DESC
+            LIMIT %s
+            """,
+            [options, options, query, user_id, user_id, limit],
+        )
+        return cursor.fetchall()
+
+
+def get_search_index():
+    """Return the index implementation for the default database, or None if unsupported"""
+    if connection.vendor == 'sqlite':
+        return SQLiteSearchIndex()
+    if connection.vendor == 'postgresql':
+        return PostgresSearchIndex()
+    return None
+
+
+def goal_document(goal: LearningGoal) -> Document:
+    return (make_rowid('goal', goal.pk), goal.pk, goal.user_id, goal.title, goal.description)
+
+
+def milestone_document(milestone: Milestone) -> Document:
+    goal = milestone.roadmap.goal
+    return (make_rowid('milestone', milestone.pk), goal.pk, goal.user_id, milestone.title, milestone.description)
+
+
+def resource_document(resource: Resource) -> Document:
+    goal = resource.milestone.roadmap.goal
+    return (make_rowid('resource', resource.pk), goal.pk, goal.user_id, resource.title, resource.description)
+
+
+def index_documents(documents: Iterable[Document], batch_size: int = 2000) -> int:
+    """Upsert documents in batches; returns the number indexed"""
+    index = get_search_index()
+    if index is None:
+        return 0
+
+    count = 0
+    batch = []
+    with connection.cursor() as cursor:
+        for document in documents:
+            batch.append(document)
+            if len(batch) >= batch_size:
+                index.upsert(cursor, batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            index.upsert(cursor, batch)
+            count += len(batch)
+    return count
+
+
+def remove_documents(kind: str, pks: Iterable[int]):
+    index = get_search_index()
+    if index is None:
+        return
+    rowids = [make_rowid(kind, pk) for pk in pks]
+    if rowids:
+        with connection.cursor() as cursor:
+            index.delete(cursor, rowids)
+
+
+def iter_documents(goal_ids: Optional[Iterable[int]] = None, chunk_size: int = 2000) -> Iterator[Document]:
+    """
+    Stream index documents straight from the database.
+
+    Uses values_list() with joined owner columns so no model instances are
+    built, and iterator() so memory stays flat however many rows there are.
+    """
+    goals = LearningGoal.objects.filter(deleted_at__isnull=True)
+    milestones = Milestone.objects.filter(roadmap__goal__deleted_at__isnull=True)
+    resources = Resource.objects.filter(milestone__roadmap__goal__deleted_at__isnull=True)
+    if goal_ids is not None:
+        goal_ids = list(goal_ids)
+        goals = goals.filter(id__in=goal_ids)
+        milestones = milestones.filter(roadmap__goal_id__in=goal_ids)
+        resources = resources.filter(milestone__roadmap__goal_id__in=goal_ids)
+
+    for pk, user_id, title, description in (
+        goals.order_by().values_list('id', 'user_id', 'title', 'description').iterator(chunk_size=chunk_size)
+    ):
+        yield (make_rowid('goal', pk), pk, user_id, title, description)
+
+    for pk, goal_id, user_id, title, description in (
+        milestones.order_by().values_list('id', 'roadmap__goal_id', 'roadmap__goal__user_id', 'title', 'description')
+        .iterator(chunk_size=chunk_size)
+    ):
+        yield (make_rowid('milestone', pk), goal_id, user_id, title, description)
+
+    for pk, goal_id, user_id, title, description in (
+        resources.order_by()
+        .values_list('id', 'milestone__roadmap__goal_id', 'milestone__roadmap__goal__user_id', 'title', 'description')
+        .iterator(chunk_size=chunk_size)
+    ):
+        yield (make_rowid('resource', pk), goal_id, user_id, title, description)
+
+
+def index_goals(goal_ids: Iterable[int]) -> int:
+    """Index every goal, milestone and resource belonging to goal_ids"""
+    goal_ids = list(goal_ids)
+    # Chunk the IN clause to stay under SQLite's bound-parameter limit
+    return sum(
+        index_documents(iter_documents(goal_ids[start:start + 500]))
+        for start in range(0, len(goal_ids), 500)
+    )
+
+
+def search(user, query: str, limit: int = 50) -> List[Dict]:
+    """
+    Ranked full-text search over one user's goals, milestones and resources.
+
+    Returns dicts with kind, object id, goal id, highlighted title/snippet
+    (safe HTML) and score, best match first.
+    """
+    terms = re.findall(r'\w+', query)
+    index = get_search_index()
+    if not terms or index is None:
+        return []
+
+    with connection.cursor() as cursor:
+        rows = index.search(cursor, user.pk, terms, limit)
+
+    results = []
+    for rowid, goal_id, title, body, score in rows:
+        kind, pk = split_rowid(rowid)
+        results.append({
+            'kind': kind,
+            'id': pk,
+            'goal_id': goal_id,
+            'title': highlight(title),
+            'snippet': highlight(body),
+            'score': score,
+        })
+    return results
@@ -0,0 +1,98 @@
+# learning_roadmap/services/template_service.py
+
+from typing import Dict, List
+from urllib.parse import quote_plus
+
+
+class TemplateRoadmapGenerator:
+    """
+    Deterministic, offline roadmap generator.
+
+    Used as the last step of the generation fallback chain so a goal can
+    still be created when every LLM backend is slow or unavailable. The
+    resources point at search pages rather than invented URLs, so they are
+    always reachable.
+    """
+
+    PHASES = [
+        ('Foundations', 'Get comfortable with the core vocabulary and basic ideas of'),
+        ('Core Concepts', 'Work through the essential concepts and techniques of'),
+        ('Hands-on Practice', 'Apply what you have learned with focused exercises on'),
+        ('Deeper Topics', 'Explore intermediate topics and common patterns in'),
+        ('Project Work', 'Build something end-to-end to consolidate your skills in'),
+        ('Review & Next Steps', 'Review weak spots and plan your continued learning in'),
+    ]
+
+    def generate_roadmap(self, goal_data: Dict, timeout: float = None) -> Dict:
+        """
+        Build a roadmap with one milestone per week
+
+        Args:
+            goal_data: Same dictionary accepted by GeminiRoadmapGenerator
+            timeout: Ignored; accepted so the generator fits the fallback chain
+
+        Returns:
+            Dictionary with roadmap structure
+        """
+        title = goal_data['title']
+        weeks = max(1, int(goal_data['target_duration_weeks']))
+        hours = float(goal_data['hours_per_week'])
+
+        milestones = []
+        for week in range(1, weeks + 1):
+            phase_idx = min((week - 1) * len(self.PHASES) // weeks, len(self.PHASES) - 1)
+            phase, lead = self.PHASES[phase_idx]
+            milestones.append({
+                'week_number': week,
+                'title': f"{phase}: {title}",
+                'description': f"{lead} {title.lower()} at the {goal_data['difficulty_level']} level.",
+                'estimated_hours': hours,
+                'resources': self.suggest_resources(f"{title} {phase.lower()}", goal_data['difficulty_level'], 2),
+            })
+
+        return {
+            'summary': (
+                f"A {weeks}-week {goal_data['difficulty_level']} plan for {title}, "
+                f"progressing from foundations to project work at {goal_data['hours_per_week']} hours per week."
+            ),
+            'milestones': milestones,
+        }
+
+    def suggest_resources(self, topic: str, difficulty: str, count: int = 5) -> List[Dict]:
+        """Suggest search-page resources for a topic"""
+        query = quote_plus(f"{topic} {difficulty}")
+        candidates = [
+            {
+                'title': f"{topic} - video tutorials",
+                'url': f"https://www.youtube.com/results?search_query={query}",
+                'resource_type': 'video',
+                'is_free': True,
+                'estimated_duration': '1 hour',
+                'description': 'Search results for video walkthroughs on this topic',
+            },
+            {
+                'title': f"{topic} - articles and guides",
+                'url': f"https://duckduckgo.com/?q={query}",
+                'resource_type': 'article',
+                'is_free': True,
+                'estimated_duration': '30 minutes',
+                'description': 'Search results for written guides on this topic',
+            },
+            {
+                'title': f"{topic} - online courses",
+                'url': f"https://www.coursera.org/search?query={query}",
+                'resource_type': 'course',
+                'is_free': False,
+                'estimated_duration': 'Varies',
+                'description': 'Structured courses covering this topic',
+            },
+            {
+                'title': f"{topic} - practice",
+                'url': f"https://www.google.com/search?q={query}+exercises",
+                'resource_type': 'practice',
+                'is_free': True,
+                'estimated_duration': '1 hour',
+                'description': 'Exercises to practise this topic',
+            },
+        ]
+        return candidates[:max(0, count)]
@@ -0,0 +1,74 @@
+# learning_roadmap/signals.py
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import LearningGoal, Milestone, Resource
+from .services.analytics_service import remove_goals
+from .services.search_service import (
+    goal_document, index_documents, milestone_document, remove_documents, resource_document,
+)
+
+
+# Fields that feed the search index; saves touching only other fields
+# (e.g. completion toggles, soft deletes) skip re-indexing
+INDEXED_FIELDS = {'title', 'description'}
+
+
+def _needs_indexing(raw, update_fields):
+    if raw:
+        return False
+    return update_fields is None or bool(INDEXED_FIELDS & set(update_fields))
+
+
+@receiver(post_save, sender=LearningGoal)
+def index_goal(sender, instance, raw=False, update_fields=None, **kwargs):
+    if _needs_indexing(raw, update_fields):
+        index_documents([goal_document(instance)])
+
+
+@receiver(post_save, sender=Milestone)
+def index_milestone(sender, instance, raw=False, update_fields=None, **kwargs):
+    if _needs_indexing(raw, update_fields):
+        index_documents([milestone_document(instance)])
+
+
+@receiver(post_save, sender=Resource)
+def index_resource(sender, instance, raw=False, update_fields=None, **kwargs):
+    if _needs_indexing(raw, update_fields):
+        index_documents([resource_document(instance)])
+
+
+# Deletes outside the purge (admin deletes, user cascades, create_goal's
+# failure path) would otherwise leave hits pointing at rows that are gone
+@receiver(post_delete, sender=LearningGoal, dispatch_uid='learning_roadmap.search.unindex_goal')
+def unindex_goal(sender, instance, **kwargs):
+    remove_documents('goal', [instance.pk])
+
+
+@receiver(post_delete, sender=Milestone, dispatch_uid='learning_roadmap.search.unindex_milestone')
+def unindex_milestone(sender, instance, **kwargs):
+    remove_documents('milestone', [instance.pk])
+
+
+@receiver(post_delete, sender=Resource, dispatch_uid='learning_roadmap.search.unindex_resource')
+def unindex_resource(sender, instance, **kwargs):
+    remove_documents('resource', [instance.pk])
+
+
+# The goal purge deletes in raw batches and removes these documents itself,
+# so it may bypass these receivers (and only these) when deciding whether a
+# model's rows must go through the collector
+PURGE_SKIPPABLE_RECEIVERS = [
+    (post_delete, LearningGoal, unindex_goal, 'learning_roadmap.search.unindex_goal'),
+    (post_delete, Milestone, unindex_milestone, 'learning_roadmap.search.unindex_milestone'),
+    (post_delete, Resource, unindex_resource, 'learning_roadmap.search.unindex_resource'),
+]
+
+
+@receiver(post_save, sender=LearningGoal)
+def uncount_deleted_goal(sender, instance, raw=False, update_fields=None, **kwargs):
+    # soft_delete() saves only these fields; bulk tombstoning goes through
+    # purge_service.soft_delete_goals, which removes the goals itself
+    if not raw and update_fields and 'deleted_at' in update_fields and instance.deleted_at:
+        remove_goals([instance.pk])
@@ -1,3 +1,753 @@
-from django.test import TestCase
+import copy
+import json
+import os
+import tempfile
+import threading
+import time
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import Permission, User
+from django.core.exceptions import ValidationError
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.models.signals import post_delete
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from .management.commands.bench_link_checker import StandInServer
+from .management.commands.check_import_time import Command as CheckImportTimeCommand
+from .models import (
+    Category, CohortStats, GoalStats, LearningGoal, LinkStatus, Milestone, Resource, ResourceCompletionStats, Roadmap,
+)
+from .services import analytics_service, search_service
+from .services.analytics_service import add_goals, rebuild_analytics
+from .services.backends import LazyBackend, get_backend
+from .services.export_service import iter_goal_records, iter_jsonl
+from .services.fake_service import FakeRoadmapGenerator
+from .services.generation_policy import (
+    GenerationPolicy, GenerationStep, LatencyHistogram, RoadmapGenerationError,
+)
+from .services.import_service import iter_jsonl_records, validate_record
+from .services.link_checker import LinkChecker, refresh_link_statuses, schedule_link_recheck
+from .services.prompt_builder import LeanPromptTemplate, get_prompt_template
+from .services.purge_service import _has_delete_listeners, purge_deleted_goals
+from .services.template_service import TemplateRoadmapGenerator
+
+
+GOAL_DATA = {
+    'title': 'Learn Python',
+    'description': 'From scratch',
+    'category': 'Coding',
+    'category_type': 'coding',
+    'difficulty_level': 'beginner',
+    'hours_per_week': 5,
+    'target_duration_weeks': 3,
+}
+
+
+class SlowFirstCallGenerator(FakeRoadmapGenerator):
+    """Fake backend whose first call stalls, so a hedge can overtake it"""
+
+    def __init__(self, first_latency: float):
+        super().__init__()
+        self.first_latency = first_latency
+        self._lock = threading.Lock()
+
+    def generate_roadmap(self, goal_data, timeout=None):
+        with self._lock:
+            first = not self.calls
+            self.calls.append(('generate_roadmap', (goal_data,)))
+        if first:
+            time.sleep(self.first_latency)
+            return {'summary': 'primary', 'milestones': []}
+        return {'summary': 'hedge', 'milestones': []}
+
+
+class GenerationPolicyTests(SimpleTestCase):
+    def _policy(self, *steps, max_workers=4):
+        policy = GenerationPolicy(list(steps), min_samples=1000, max_workers=max_workers)
+        self.addCleanup(policy._executor.shutdown, wait=False, cancel_futures=True)
+        return policy
+
+    def test_returns_first_step_result(self):
+        fake = FakeRoadmapGenerator()
+        step = GenerationStep('fake', fake, deadline=1)
+        roadmap = self._policy(step).generate_roadmap(GOAL_DATA)
+
+        self.assertEqual(len(roadmap['milestones']), 3)
+        self.assertEqual(len(fake.calls), 1)
+        self.assertEqual(step.histogram.total, 1)
+
+    def test_error_falls_back_to_next_step(self):
+        policy = self._policy(
+            GenerationStep('broken', FakeRoadmapGenerator(fail=True), deadline=1),
+            GenerationStep('template', TemplateRoadmapGenerator()),
+        )
+        self.assertIn('3-week', policy.generate_roadmap(GOAL_DATA)['summary'])
+
+    def test_deadline_falls_back_to_next_step(self):
+        policy = self._policy(
+            GenerationStep('slow', FakeRoadmapGenerator(latency=0.5), deadline=0.1),
+            GenerationStep('template', TemplateRoadmapGenerator()),
+        )
+        started = time.monotonic()
+        policy.generate_roadmap(GOAL_DATA)
+        self.assertLess(time.monotonic() - started, 0.4)
+
+    def test_all_steps_failing_raises(self):
+        policy = self._policy(
+            GenerationStep('first', FakeRoadmapGenerator(fail=True), deadline=1),
+            GenerationStep('second', FakeRoadmapGenerator(fail=True, error_message='down')),
+        )
+        with self.assertRaisesMessage(RoadmapGenerationError, 'second: down'):
+            policy.generate_roadmap(GOAL_DATA)
+
+    def test_hedge_overtakes_slow_primary(self):
+        generator = SlowFirstCallGenerator(first_latency=0.5)
+        step = GenerationStep('hedged', generator, deadline=2, hedge=True, hedge_after=0.05)
+        started = time.monotonic()
+        roadmap = self._policy(step).generate_roadmap(GOAL_DATA)
+
+        self.assertEqual(roadmap['summary'], 'hedge')
+        self.assertLess(time.monotonic() - started, 0.4)
+        self.assertEqual(len(generator.calls), 2)
+
+    def test_fallback_does_not_wait_for_saturated_pool(self):
+        slow = FakeRoadmapGenerator(latency=0.6)
+        policy = self._policy(
+            GenerationStep('slow', slow, deadline=0.1),
+            GenerationStep('template', TemplateRoadmapGenerator()),
+            max_workers=2,
+        )
+        for _ in range(6):
+            started = time.monotonic()
+            policy.generate_roadmap(GOAL_DATA)
+            self.assertLess(time.monotonic() - started, 0.3)
+
+    def test_queued_calls_are_cancelled_after_deadline(self):
+        slow = FakeRoadmapGenerator(latency=0.3)
+        policy = self._policy(
+            GenerationStep('slow', slow, deadline=0.05),
+            GenerationStep('template', TemplateRoadmapGenerator()),
+            max_workers=1,
+        )
+        policy.generate_roadmap(GOAL_DATA)  # occupies the only worker
+        policy.generate_roadmap(GOAL_DATA)  # queues behind it, then gives up
+        time.sleep(0.5)
+        self.assertEqual(len(slow.calls), 1)
+
+
+class LatencyHistogramTests(SimpleTestCase):
+    def test_percentile_uses_bucket_upper_bound(self):
+        histogram = LatencyHistogram()
+        for _ in range(90):
+            histogram.observe(0.2)
+        for _ in range(10):
+            histogram.observe(7)
+        self.assertEqual(histogram.percentile(50), 0.25)
+        self.assertEqual(histogram.percentile(95), 8)
+
+    def test_counts_decay(self):
+        histogram = LatencyHistogram(window=10)
+        for _ in range(10):
+            histogram.observe(1)
+        self.assertEqual(histogram.total, 5)
+
+
+class BackendRegistryTests(SimpleTestCase):
+    def test_backend_loads_on_first_call(self):
+        with mock.patch('learning_roadmap.services.backends.import_string',
+                        return_value=FakeRoadmapGenerator) as import_string:
+            backend = get_backend('fake', latency=0)
+            self.assertIsInstance(backend, LazyBackend)
+            self.assertFalse(backend.is_loaded)
+            import_string.assert_not_called()
+
+            roadmap = backend.generate_roadmap(GOAL_DATA)
+            backend.suggest_resources('Python', 'beginner')
+
+        import_string.assert_called_once_with('learning_roadmap.services.fake_service.FakeRoadmapGenerator')
+        self.assertTrue(backend.is_loaded)
+        self.assertEqual(len(roadmap['milestones']), 3)
+        self.assertEqual(len(backend.load().calls), 2)
+
+    def test_unknown_backend(self):
+        with self.assertRaisesMessage(ValueError, 'Unknown generation backend: nope'):
+            get_backend('nope')
+
+    @override_settings(ROADMAP_BACKENDS={'custom': 'learning_roadmap.services.fake_service.FakeRoadmapGenerator'})
+    def test_settings_add_backends(self):
+        self.assertEqual(get_backend('custom').path, 'learning_roadmap.services.fake_service.FakeRoadmapGenerator')
+        self.assertEqual(get_backend('template').name, 'template')
+
+
+IMPORTTIME_SAMPLE = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:        85 |         85 |       marshal
+import time:       410 |        495 |     encodings
+import time:      1502 |       2117 | django
+some unrelated stderr line
+import time:   garbage |          1 | broken
+"""
+
+
+class CheckImportTimeParseTests(SimpleTestCase):
+    def test_parses_depth_and_cumulative(self):
+        timings = CheckImportTimeCommand._parse(IMPORTTIME_SAMPLE)
+
+        self.assertEqual(timings, {
+            '_io': (120, 120, 1),
+            'marshal': (85, 85, 3),
+            'encodings': (410, 495, 2),
+            'django': (1502, 2117, 0),
+        })
+
+
+class LeanPromptTemplateTests(SimpleTestCase):
+    def setUp(self):
+        self.template = LeanPromptTemplate()
+
+    def test_expand_reverses_render(self):
+        roadmap = TemplateRoadmapGenerator().generate_roadmap(dict(GOAL_DATA, target_duration_weeks=4))
+        answer = json.loads(self.template.render(roadmap, 4))
+
+        expected = copy.deepcopy(roadmap)
+        for milestone in expected['milestones']:
+            for resource in milestone['resources']:
+                # Resource descriptions aren't part of the lean answer
+                resource['description'] = ''
+        self.assertEqual(self.template.expand(answer), expected)
+
+    def test_expand_rejects_missing_keys(self):
+        with self.assertRaises(ValueError):
+            self.template.expand({'s': 'Summary', 'm': [{'w': 1, 't': 'Week one'}]})
+        with self.assertRaises(ValueError):
+            self.template.expand({'m': []})
+
+    def test_expand_parses_free_flag(self):
+        answer = {'s': 'Summary', 'm': [{'w': 1, 't': 'Week one', 'h': 3, 'r': [
+            {'t': 'Paid', 'u': 'https://example.com/a', 'f': '0'},
+            {'t': 'Free', 'u': 'https://example.com/b', 'f': 1},
+            {'t': 'Default', 'u': 'https://example.com/c'},
+        ]}]}
+        resources = self.template.expand(answer)['milestones'][0]['resources']
+        self.assertEqual([resource['is_free'] for resource in resources], [False, True, True])
+
+    def test_output_tiers(self):
+        self.assertEqual(self.template.output_plan(4), (3, 20))
+        self.assertEqual(self.template.output_plan(5), (2, 12))
+        self.assertEqual(self.template.output_plan(12), (2, 12))
+        self.assertEqual(self.template.output_plan(13), (2, 0))
+        self.assertEqual(self.template.output_plan(52), (2, 0))
+
+    def test_output_budget_boundaries(self):
+        self.assertEqual(self.template.output_budget(1), LeanPromptTemplate.MIN_OUTPUT_TOKENS)
+        self.assertEqual(self.template.output_budget(4), 1185)
+        self.assertEqual(self.template.output_budget(5), 1058)
+        self.assertEqual(self.template.output_budget(12), 2394)
+        self.assertEqual(self.template.output_budget(13), 2301)
+        self.assertEqual(self.template.output_budget(52), LeanPromptTemplate.MAX_OUTPUT_TOKENS)
+
+    def test_build_uses_budget_and_shared_prefix(self):
+        short = self.template.build(dict(GOAL_DATA, target_duration_weeks=4))
+        long = self.template.build(dict(GOAL_DATA, target_duration_weeks=52))
+
+        self.assertEqual(short.prefix, long.prefix)
+        self.assertEqual(short.prefix_key, ('v2', 'coding', 'beginner'))
+        self.assertEqual(long.generation_config['max_output_tokens'], 8192)
+        self.assertIn('Resources per milestone: 3', short.request)
+
+    def test_unknown_version(self):
+        with self.assertRaises(ValueError):
+            get_prompt_template('v9')
+        self.assertEqual(get_prompt_template().version, 'v2')
+
+
+def make_goal(user, title='Learn Python', weeks=2, resources_per_week=1):
+    """Goal with a roadmap of one milestone per week, each with a few resources"""
+    category, _ = Category.objects.get_or_create(name='Coding', defaults={'category_type': 'coding'})
+    goal = LearningGoal.objects.create(
+        user=user, category=category, title=title, description='Practice every day',
+        difficulty_level='beginner', hours_per_week=5, target_duration_weeks=weeks,
+    )
+    roadmap = Roadmap.objects.create(goal=goal, ai_summary='Summary')
+    for week in range(1, weeks + 1):
+        milestone = Milestone.objects.create(
+            roadmap=roadmap, title=f'Week {week} zebrafish', description='Basics',
+            week_number=week, order=1, estimated_hours=5,
+        )
+        for n in range(resources_per_week):
+            Resource.objects.create(
+                milestone=milestone, title=f'Okapi guide {week}.{n}', url=f'https://example.com/{week}/{n}',
+                resource_type='article',
+            )
+    return goal
+
+
+class SearchIndexSyncTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('learner')
+        self.goal = make_goal(self.user)
+
+    def _hits(self, query, kind):
+        return {hit['id'] for hit in search_service.search(self.user, query) if hit['kind'] == kind}
+
+    def test_deleted_resource_is_removed_from_index(self):
+        resource = Resource.objects.first()
+        resource_id = resource.pk
+        self.assertIn(resource_id, self._hits('okapi', 'resource'))
+
+        resource.delete()
+        self.assertNotIn(resource_id, self._hits('okapi', 'resource'))
+
+    def _indexed_rows(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM {search_service.FTS_TABLE}")
+            return cursor.fetchone()[0]
+
+    def test_deleted_milestone_takes_its_resources_out_of_results(self):
+        milestone = Milestone.objects.first()
+        milestone_id = milestone.pk
+        resource_ids = set(milestone.resources.values_list('id', flat=True))
+
+        milestone.delete()
+        self.assertNotIn(milestone_id, self._hits('zebrafish', 'milestone'))
+        self.assertFalse(resource_ids & self._hits('okapi', 'resource'))
+
+    def test_cascading_goal_delete_removes_all_documents(self):
+        self.assertEqual(self._indexed_rows(), 5)
+        self.goal.delete()
+        self.assertEqual(self._indexed_rows(), 0)
+
+    def test_previous_owner_loses_hits_after_transfer(self):
+        other = User.objects.create_user('other')
+        LearningGoal.objects.filter(pk=self.goal.pk).update(user=other)
+
+        self.assertEqual(search_service.search(self.user, 'okapi'), [])
+        self.assertEqual(search_service.search(self.user, 'zebrafish'), [])
+
+    def test_admin_owner_change_reindexes_children(self):
+        admin_user = User.objects.create_superuser('admin', 'admin@example.com', 'pw')
+        other = User.objects.create_user('other')
+        self.client.force_login(admin_user)
+        url = reverse('admin:learning_roadmap_learninggoal_change', args=[self.goal.pk])
+        data = {
+            'user': other.pk, 'category': self.goal.category_id, 'title': self.goal.title,
+            'description': self.goal.description, 'difficulty_level': self.goal.difficulty_level,
+            'hours_per_week': self.goal.hours_per_week, 'target_duration_weeks': self.goal.target_duration_weeks,
+            'is_active': 'on',
+        }
+
+        response = self.client.post(url, data)
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(len([hit for hit in search_service.search(other, 'okapi') if hit['kind'] == 'resource']), 2)
+        self.assertEqual(search_service.search(self.user, 'okapi'), [])
+
+    def test_index_receivers_keep_purge_on_raw_deletes(self):
+        for model in (LearningGoal, Milestone, Resource):
+            self.assertFalse(_has_delete_listeners(model))
+
+    def test_other_delete_listeners_are_detected(self):
+        def listener(sender, **kwargs):
+            pass
+
+        post_delete.connect(listener, sender=Resource)
+        self.addCleanup(post_delete.disconnect, listener, sender=Resource)
+
+        self.assertTrue(_has_delete_listeners(Resource))
+        self.assertFalse(_has_delete_listeners(Milestone))
+
+    def test_listener_check_leaves_index_receivers_connected(self):
+        _has_delete_listeners(Resource)
+        resource = Resource.objects.first()
+        resource_id = resource.pk
+
+        resource.delete()
+        self.assertNotIn(resource_id, self._hits('okapi', 'resource'))
+
+    def test_purge_removes_documents(self):
+        self.goal.soft_delete()
+        purge_deleted_goals(throttle=0)
+        self.assertEqual(search_service.search(self.user, 'okapi'), [])
+        self.assertFalse(LearningGoal.objects.exists())
+
+
+VALID_RECORD = {
+    'title': 'Learn Spanish',
+    'category': 'Languages',
+    'category_type': 'language',
+    'difficulty_level': 'beginner',
+    'hours_per_week': 3,
+    'target_duration_weeks': 1,
+    'roadmap': {
+        'summary': 'One week of basics',
+        'milestones': [{
+            'week_number': 1, 'title': 'Greetings', 'estimated_hours': 3,
+            'resources': [{'title': 'Podcast', 'url': 'https://example.com/p', 'resource_type': 'video'}],
+        }],
+    },
+}
+
+
+class ValidateRecordTests(SimpleTestCase):
+    def _invalid(self, change):
+        record = copy.deepcopy(VALID_RECORD)
+        change(record)
+        with self.assertRaises(ValidationError):
+            validate_record(record)
+
+    def test_valid_record(self):
+        self.assertEqual(validate_record(copy.deepcopy(VALID_RECORD)), VALID_RECORD)
+
+    def test_missing_field(self):
+        self._invalid(lambda r: r.pop('title'))
+
+    def test_bool_is_not_a_number(self):
+        self._invalid(lambda r: r.update(hours_per_week=True))
+
+    def test_unknown_choices(self):
+        self._invalid(lambda r: r.update(difficulty_level='expert'))
+        self._invalid(lambda r: r.update(category_type='cooking'))
+        self._invalid(lambda r: r['roadmap']['milestones'][0]['resources'][0].update(resource_type='podcast'))
+
+    def test_bad_url(self):
+        self._invalid(lambda r: r['roadmap']['milestones'][0]['resources'][0].update(url='not a url'))
+
+    def test_optional_fields_are_type_checked(self):
+        milestone = lambda r: r['roadmap']['milestones'][0]
+        resource = lambda r: milestone(r)['resources'][0]
+        self._invalid(lambda r: r.update(category_type=['x']))
+        self._invalid(lambda r: r.update(description=None))
+        self._invalid(lambda r: milestone(r).update(description=None))
+        self._invalid(lambda r: milestone(r).update(order='1'))
+        self._invalid(lambda r: milestone(r).update(is_completed=1))
+        self._invalid(lambda r: milestone(r).update(resources=None))
+        self._invalid(lambda r: resource(r).update(is_free='0'))
+        self._invalid(lambda r: resource(r).update(estimated_duration=2))
+        self._invalid(lambda r: resource(r).update(description=None))
+
+    def test_completed_at_must_parse(self):
+        milestone = lambda r: r['roadmap']['milestones'][0]
+        self._invalid(lambda r: milestone(r).update(completed_at=5))
+        self._invalid(lambda r: milestone(r).update(completed_at='yesterday'))
+        self._invalid(lambda r: milestone(r).update(completed_at='2024-02-30T10:00:00'))
+        self._invalid(lambda r: milestone(r)['resources'][0].update(completed_at=5))
+
+        record = copy.deepcopy(VALID_RECORD)
+        milestone(record).update(is_completed=True, completed_at='2024-02-01T10:00:00+00:00')
+        milestone(record)['resources'][0].update(completed_at=None)
+        validate_record(record)
+
+    def test_lengths_are_checked(self):
+        self._invalid(lambda r: r.update(title='x' * 201))
+        self._invalid(lambda r: r.update(category='x' * 101))
+        self._invalid(lambda r: r['roadmap']['milestones'][0].update(title='x' * 201))
+        self._invalid(lambda r: r['roadmap']['milestones'][0]['resources'][0].update(
+            url='https://example.com/' + 'x' * 200))
+        self._invalid(lambda r: r['roadmap']['milestones'][0]['resources'][0].update(estimated_duration='x' * 51))
+
+    def test_iter_jsonl_records_reports_each_line(self):
+        lines = [json.dumps(VALID_RECORD), '', '{broken', json.dumps({'title': 'x'})]
+        results = list(iter_jsonl_records(lines))
+
+        self.assertEqual([line for line, _, _ in results], [1, 3, 4])
+        self.assertIsNone(results[0][2])
+        self.assertIn('invalid JSON', results[1][2])
+        self.assertIn("missing 'category'", results[2][2])
+
+
+def _strip_volatile(record):
+    """Drop ids, owner and timestamps that legitimately change across an import"""
+    record = {k: v for k, v in record.items() if k not in ('id', 'user', 'created_at')}
+    for milestone in record['roadmap']['milestones']:
+        milestone.pop('id')
+        for resource in milestone['resources']:
+            resource.pop('id')
+    return record
+
+
+class ImportRoundTripTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user('owner')
+        self.other = User.objects.create_user('other')
+        make_goal(self.owner, title='Learn Python', weeks=3, resources_per_week=2)
+        Milestone.objects.filter(week_number=1).update(is_completed=True)
+
+    def _write(self, lines):
+        f = tempfile.NamedTemporaryFile('w', suffix='.jsonl', delete=False, encoding='utf-8')
+        f.writelines(lines)
+        f.close()
+        self.addCleanup(os.unlink, f.name)
+        return f.name
+
+    def _import(self, path, *args):
+        call_command('import_roadmaps', path, *args, stdout=StringIO(), stderr=StringIO())
+
+    def test_export_import_round_trip(self):
+        original = [_strip_volatile(r) for r in iter_goal_records(LearningGoal.objects.filter(user=self.owner))]
+        self._import(self._write(iter_jsonl(iter_goal_records())), '--user', 'other')
+
+        imported = [_strip_volatile(r) for r in iter_goal_records(LearningGoal.objects.filter(user=self.other))]
+        self.assertEqual(imported, original)
+        self.assertEqual(Resource.objects.filter(milestone__roadmap__goal__user=self.other).count(), 6)
+
+    def test_unknown_user_aborts_import(self):
+        ghost = dict(VALID_RECORD, user='ghost')
+        path = self._write([json.dumps(dict(VALID_RECORD, user='other')) + '\n', json.dumps(ghost) + '\n'])
+
+        with self.assertRaisesMessage(CommandError, "line 2: goal: user 'ghost' does not exist"):
+            self._import(path)
+        self.assertFalse(LearningGoal.objects.filter(user=self.other).exists())
+
+    def test_malformed_optional_fields_are_skipped_with_skip_invalid(self):
+        bad = copy.deepcopy(VALID_RECORD)
+        bad['roadmap']['milestones'][0].update(description=None, completed_at=5)
+        path = self._write([json.dumps(bad) + '\n', json.dumps(VALID_RECORD) + '\n'])
+
+        self._import(path, '--user', 'other', '--skip-invalid')
+        self.assertEqual(LearningGoal.objects.filter(user=self.other).count(), 1)
+
+    def test_unknown_user_is_skipped_with_skip_invalid(self):
+        ghost = dict(VALID_RECORD, user='ghost')
+        path = self._write([json.dumps(dict(VALID_RECORD, user='other')) + '\n', json.dumps(ghost) + '\n'])
+
+        self._import(path, '--skip-invalid')
+        self.assertEqual(LearningGoal.objects.filter(user=self.other).count(), 1)
+
+
+class CompletionToggleTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('learner')
+        self.client.force_login(self.user)
+        self.goal = make_goal(self.user, weeks=2)
+        add_goals([self.goal.pk])
+
+    def _toggle_with_stale_read(self, model, url_name, obj):
+        """POST twice, both requests having read the row before either wrote it"""
+        stale = model.objects.get(pk=obj.pk)
+        self.client.post(reverse(url_name, args=[obj.pk]))
+        with mock.patch('learning_roadmap.views.get_object_or_404', return_value=stale):
+            return self.client.post(reverse(url_name, args=[obj.pk])).json()
+
+    def test_overlapping_milestone_toggles_count_once(self):
+        milestone = Milestone.objects.filter(roadmap__goal=self.goal).first()
+
+        response = self._toggle_with_stale_read(Milestone, 'complete_milestone', milestone)
+
+        self.assertTrue(response['is_completed'])
+        self.assertTrue(Milestone.objects.get(pk=milestone.pk).is_completed)
+        self.assertEqual(GoalStats.objects.get(goal=self.goal).completed_milestones, 1)
+
+    def test_overlapping_resource_toggles_count_once(self):
+        resource = Resource.objects.filter(milestone__roadmap__goal=self.goal).first()
+
+        response = self._toggle_with_stale_read(Resource, 'complete_resource', resource)
+
+        self.assertTrue(response['is_completed'])
+        self.assertEqual(ResourceCompletionStats.objects.get(url=resource.url).completions, 1)
+
+    def test_toggle_back_reverts_stats(self):
+        milestone = Milestone.objects.filter(roadmap__goal=self.goal).first()
+        url = reverse('complete_milestone', args=[milestone.pk])
+
+        self.client.post(url)
+        response = self.client.post(url).json()
+
+        self.assertFalse(response['is_completed'])
+        self.assertEqual(GoalStats.objects.get(goal=self.goal).completed_milestones, 0)
+
+
+class LinkCheckerTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = StandInServer(hosts=2)
+        cls.server.__enter__()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.__exit__(None, None, None)
+        super().tearDownClass()
+
+    def test_classifies_stand_in_responses(self):
+        urls = list(self.server.urls(20))
+        results = LinkChecker(concurrency=4, per_host=2, timeout=5).check(urls)
+
+        self.assertEqual([result.url for result in results], urls)
+        by_kind = {url.split('/')[3]: result for url, result in zip(urls, results)}
+        self.assertEqual(by_kind['ok'].status, 'ok')
+        self.assertEqual((by_kind['missing'].status, by_kind['missing'].http_status), ('broken', 404))
+        # HEAD is rejected with 405, so the checker falls back to GET
+        self.assertEqual((by_kind['nohead'].status, by_kind['nohead'].http_status), ('ok', 200))
+        self.assertEqual(by_kind['slow'].status, 'ok')
+
+    def test_unknown_path_is_broken_and_unreachable_host_is_an_error(self):
+        [result] = LinkChecker(timeout=5).check([f'http://127.0.0.1:{self.server.port}/nowhere'])
+        self.assertEqual((result.status, result.http_status), ('broken', 404))
+
+        [result] = LinkChecker(timeout=5).check(['http://127.0.0.1:1/'])
+        self.assertEqual(result.status, 'error')
+        self.assertTrue(result.error)
+
+    def test_dropped_head_falls_back_to_get(self):
+        url = f'http://{self.server.addresses[0]}:{self.server.port}/drophead/1'
+        [result] = LinkChecker(timeout=5).check([url])
+        self.assertEqual((result.status, result.http_status), ('ok', 200))
+
+    def test_refresh_stores_statuses(self):
+        urls = list(self.server.urls(3))
+        checker = LinkChecker(concurrency=2, timeout=5)
+
+        self.assertEqual(refresh_link_statuses(urls, checker=checker), 3)
+        self.assertEqual(LinkStatus.objects.filter(url__in=urls, status='ok').count(), 3)
+
+    def test_bench_command_passes_against_stand_in_server(self):
+        stdout = StringIO()
+        call_command('bench_link_checker', '--urls', '40', '--hosts', '2', '--concurrency', '8', stdout=stdout)
+        self.assertIn('All URLs classified correctly', stdout.getvalue())
+
+
+class StandInServerTests(SimpleTestCase):
+    def test_start_failure_is_raised(self):
+        server = StandInServer(hosts=1)
+        server.addresses = ['256.0.0.1']
+        with self.assertRaisesMessage(RuntimeError, 'failed to start'):
+            with server:
+                pass
+
+    def test_start_timeout_is_raised(self):
+        server = StandInServer(hosts=1)
+        server.START_TIMEOUT = 0.05
+        with mock.patch.object(server, '_serve'), self.assertRaisesMessage(RuntimeError, 'did not start'):
+            with server:
+                pass
+
+
+class LinkRecheckTests(SimpleTestCase):
+    def test_recheck_runs_in_background(self):
+        release = threading.Event()
+        done = threading.Event()
+
+        def slow_refresh(urls, max_age):
+            release.wait(5)
+            done.set()
+
+        with mock.patch('learning_roadmap.services.link_checker.refresh_link_statuses', side_effect=slow_refresh) as refresh:
+            self.assertEqual(schedule_link_recheck(['https://a.example', 'https://a.example', 'https://b.example']), 2)
+            self.assertFalse(done.is_set())
+            release.set()
+            self.assertTrue(done.wait(5))
+
+        refresh.assert_called_once_with(['https://a.example', 'https://b.example'], max_age=None)
+
+
+@override_settings(GOAL_PURGE={'PURGE_ON_DELETE': False})
+class GoalAdminDeleteTests(TestCase):
+    def _delete_selected(self, goal):
+        return self.client.post(reverse('admin:learning_roadmap_learninggoal_changelist'), {
+            'action': 'delete_selected', '_selected_action': [goal.pk], 'post': 'yes',
+        })
+
+    def _staff(self, *perms):
+        user = User.objects.create_user('staff', is_staff=True)
+        user.user_permissions.set(Permission.objects.filter(
+            content_type__app_label='learning_roadmap', codename__in=perms,
+        ))
+        self.client.force_login(user)
+        return user
+
+    def test_delete_selected_tombstones_goals(self):
+        admin_user = User.objects.create_superuser('admin', 'admin@example.com', 'pw')
+        self.client.force_login(admin_user)
+        goal = make_goal(admin_user)
+
+        response = self._delete_selected(goal)
+
+        self.assertEqual(response.status_code, 302)
+        goal.refresh_from_db()
+        self.assertIsNotNone(goal.deleted_at)
+        # The rows stay until the purge runs
+        self.assertTrue(Roadmap.objects.filter(goal=goal).exists())
+
+    def test_purged_rows_need_delete_permission(self):
+        user = self._staff('view_learninggoal', 'delete_learninggoal')
+        goal = make_goal(user)
+
+        self.assertEqual(self._delete_selected(goal).status_code, 403)
+        goal.refresh_from_db()
+        self.assertIsNone(goal.deleted_at)
+
+        response = self.client.get(reverse('admin:learning_roadmap_learninggoal_delete', args=[goal.pk]))
+        self.assertEqual(set(response.context['perms_lacking']), {'roadmap', 'milestone', 'resource'})
+
+    def test_delete_with_child_permissions(self):
+        user = self._staff('view_learninggoal', 'delete_learninggoal', 'delete_roadmap',
+                           'delete_milestone', 'delete_resource')
+        goal = make_goal(user)
+
+        self.assertEqual(self._delete_selected(goal).status_code, 302)
+        goal.refresh_from_db()
+        self.assertIsNotNone(goal.deleted_at)
+
+
+class RoadmapDetailPagingTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('learner')
+        self.client.force_login(self.user)
+        self.goal = make_goal(self.user, weeks=10)
+
+    def _detail(self, query=''):
+        return self.client.get(reverse('roadmap_detail', args=[self.goal.pk]) + query)
+
+    def test_long_roadmaps_render_the_first_weeks_only(self):
+        response = self._detail()
+
+        self.assertTrue(response.context['paged'])
+        loaded = [week for week, milestones in response.context['weeks'].items() if milestones is not None]
+        self.assertEqual(loaded, [1, 2])
+        self.assertFalse(self._detail('?all=1').context['paged'])
+
+    def test_threshold_defaults_when_unset(self):
+        with self.settings():
+            del settings.ROADMAP_DETAIL_PAGED_MIN_WEEKS
+            self.assertTrue(self._detail().context['paged'])
+
+    @override_settings(ROADMAP_DETAIL_PAGED_MIN_WEEKS=12)
+    def test_threshold_is_configurable(self):
+        self.assertFalse(self._detail().context['paged'])
+
+
+class RebuildAnalyticsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('learner')
+        self.goals = [make_goal(self.user, title=f'Goal {n}') for n in range(3)]
+        add_goals([goal.pk for goal in self.goals])
+        Milestone.objects.filter(roadmap__goal=self.goals[0]).update(is_completed=True)
+
+    def test_repairs_drift(self):
+        self.assertEqual(rebuild_analytics(verify_only=True, chunk_size=2)['goal_stats'], 1)
+
+        drift = rebuild_analytics(chunk_size=2)
+
+        self.assertEqual(drift['goal_stats'], 1)
+        self.assertEqual(GoalStats.objects.get(goal=self.goals[0]).completed_milestones, 2)
+        self.assertEqual(CohortStats.objects.get().completed_milestones, 2)
+        self.assertFalse(any(rebuild_analytics(verify_only=True).values()))
+
+    def test_scan_runs_outside_transactions(self):
+        depth = len(connection.atomic_blocks)
+        seen = []
+        real = analytics_service.compute_goal_stats
+
+        def compute(goals):
+            seen.append(len(connection.atomic_blocks) - depth)
+            return real(goals)
+
+        with mock.patch.object(analytics_service, 'compute_goal_stats', side_effect=compute):
+            rebuild_analytics(chunk_size=1)
+
+        self.assertEqual(seen, [0, 0, 0])
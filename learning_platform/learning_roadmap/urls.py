@@ -5,7 +5,11 @@ urlpatterns = [
     path('', views.dashboard, name='dashboard'),
     path('goal/create/', views.create_goal, name='create_goal'),
     path('goal/<int:goal_id>/', views.roadmap_detail, name='roadmap_detail'),
+    path('goal/<int:goal_id>/week/<int:week_number>/', views.roadmap_week, name='roadmap_week'),
     path('goal/<int:goal_id>/delete/', views.delete_goal, name='delete_goal'),
+    path('search/', views.search, name='search'),
+    path('export/', views.export_goals, name='export_goals'),
+    path('analytics/', views.analytics, name='analytics'),
     path('milestone/<int:milestone_id>/complete/', views.complete_milestone, name='complete_milestone'),
     path('resource/<int:resource_id>/complete/', views.complete_resource, name='complete_resource'),
 ]
\ No newline at end of file
@@ -2,11 +2,20 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.http import JsonResponse
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.db import transaction
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 from django.utils import timezone
-from .models import LearningGoal, Roadmap, Milestone, Resource, Progress, Category
+from .models import LearningGoal, Roadmap, Milestone, Resource, Progress, Category, LinkStatus
 from .forms import LearningGoalForm
-from .services.gemini_service import GeminiRoadmapGenerator
+from .services.analytics_service import add_goals, get_analytics, record_milestone_toggle, record_resource_toggle
+from .services.generation_policy import get_generation_policy
+from .services.link_checker import schedule_link_check
+from .services.roadmap_service import goal_prompt_data, materialize_roadmap
+from .services.purge_service import schedule_purge
+from .services import search_service
+from .services.export_service import EXPORT_FORMATS, iter_goal_records
 
 @login_required
 def dashboard(request):
@@ -40,48 +49,20 @@ def create_goal(request):
             goal.user = request.user
             goal.save()
             
-            # Generate roadmap using Gemini
+            # Generate roadmap through the hedged fallback chain
             try:
-                generator = GeminiRoadmapGenerator()
-                goal_data = {
-                    'title': goal.title,
-                    'description': goal.description,
-                    'category': goal.category.name,
-                    'difficulty_level': goal.difficulty_level,
-                    'hours_per_week': goal.hours_per_week,
-                    'target_duration_weeks': goal.target_duration_weeks
-                }
+                generator = get_generation_policy()
+                roadmap_data = generator.generate_roadmap(goal_prompt_data(goal))
                 
-                roadmap_data = generator.generate_roadmap(goal_data)
-                
-                # Create roadmap
+                # Create roadmap, milestones and resources
                 roadmap = Roadmap.objects.create(
                     goal=goal,
                     ai_summary=roadmap_data['summary']
                 )
+                resource_urls = materialize_roadmap(roadmap, roadmap_data)
+                add_goals([goal.id])
                 
-                # Create milestones and resources
-                for idx, milestone_data in enumerate(roadmap_data['milestones'], 1):
-                    milestone = Milestone.objects.create(
-                        roadmap=roadmap,
-                        title=milestone_data['title'],
-                        description=milestone_data['description'],
-                        week_number=milestone_data['week_number'],
-                        order=idx,
-                        estimated_hours=milestone_data['estimated_hours']
-                    )
-                    
-                    # Create resources for this milestone
-                    for resource_data in milestone_data.get('resources', []):
-                        Resource.objects.create(
-                            milestone=milestone,
-                            title=resource_data['title'],
-                            url=resource_data['url'],
-                            resource_type=resource_data['resource_type'],
-                            is_free=resource_data['is_free'],
-                            estimated_duration=resource_data.get('estimated_duration', ''),
-                            description=resource_data.get('description', '')
-                        )
+                schedule_link_check(resource_urls)
                 
                 messages.success(request, 'Goal created and roadmap generated successfully!')
                 return redirect('roadmap_detail', goal_id=goal.id)
@@ -96,41 +77,110 @@ def create_goal(request):
     return render(request, 'learning_roadmap/create_goal.html', {'form': form})
 
 
+def _group_by_week(milestones):
+    """Group milestones by week, flagging resources whose URL failed the last health check"""
+    urls = {resource.url for milestone in milestones for resource in milestone.resources.all()}
+    flagged = dict(
+        LinkStatus.objects.filter(url__in=urls).exclude(status='ok').values_list('url', 'status')
+    )
+    
+    weeks = {}
+    for milestone in milestones:
+        for resource in milestone.resources.all():
+            resource.link_status = flagged.get(resource.url)
+        weeks.setdefault(milestone.week_number, []).append(milestone)
+    return dict(sorted(weeks.items()))
+
+
 @login_required
 def roadmap_detail(request, goal_id):
     """View detailed roadmap for a goal"""
-    goal = get_object_or_404(LearningGoal, id=goal_id, user=request.user)
+    goal = get_object_or_404(LearningGoal, id=goal_id, user=request.user, deleted_at__isnull=True)
     
     if not hasattr(goal, 'roadmap'):
         messages.error(request, 'No roadmap found for this goal.')
         return redirect('dashboard')
     
     roadmap = goal.roadmap
-    milestones = roadmap.milestones.prefetch_related('resources').all()
+    week_numbers = list(
+        roadmap.milestones.order_by('week_number').values_list('week_number', flat=True).distinct()
+    )
+    paged = len(week_numbers) > getattr(settings, 'ROADMAP_DETAIL_PAGED_MIN_WEEKS', 8) and 'all' not in request.GET
     
-    # Group milestones by week
-    weeks = {}
-    for milestone in milestones:
-        week = milestone.week_number
-        if week not in weeks:
-            weeks[week] = []
-        weeks[week].append(milestone)
+    if paged:
+        # Render the current and next week; the rest load on demand from roadmap_week
+        current = (
+            roadmap.milestones.filter(is_completed=False).order_by('week_number')
+            .values_list('week_number', flat=True).first()
+        )
+        start = week_numbers.index(current) if current is not None else 0
+        eager = week_numbers[start:start + 2]
+        milestones = roadmap.milestones.filter(week_number__in=eager).prefetch_related('resources')
+        loaded = _group_by_week(milestones)
+        weeks = {week: loaded.get(week) for week in week_numbers}
+    else:
+        weeks = _group_by_week(roadmap.milestones.prefetch_related('resources').all())
     
     context = {
         'goal': goal,
         'roadmap': roadmap,
-        'weeks': dict(sorted(weeks.items())),
+        'weeks': weeks,
+        'paged': paged,
         'progress_percentage': roadmap.get_progress_percentage()
     }
     
     return render(request, 'learning_roadmap/roadmap_detail.html', context)
 
 
+@login_required
+def roadmap_week(request, goal_id, week_number):
+    """Render a single week of a roadmap as an HTML fragment"""
+    goal = get_object_or_404(LearningGoal, id=goal_id, user=request.user, deleted_at__isnull=True)
+    roadmap = get_object_or_404(Roadmap, goal=goal)
+    
+    milestones = roadmap.milestones.filter(week_number=week_number).prefetch_related('resources')
+    weeks = _group_by_week(milestones)
+    if not weeks:
+        raise Http404('No milestones for this week.')
+    
+    return render(request, 'learning_roadmap/_week.html', {
+        'week_num': week_number,
+        'milestones': weeks[week_number],
+    })
+
+
+@login_required
+def search(request):
+    """Full-text search across the user's goals, milestones and resources"""
+    query = request.GET.get('q', '').strip()
+    results = search_service.search(request.user, query) if query else []
+    
+    context = {
+        'query': query,
+        'results': results
+    }
+    return render(request, 'learning_roadmap/search.html', context)
+
+
+@login_required
+def export_goals(request):
+    """Stream all of the user's goals as JSON Lines or CSV"""
+    export_format = request.GET.get('format', 'jsonl')
+    if export_format not in EXPORT_FORMATS:
+        return JsonResponse({'error': 'Unsupported format'}, status=400)
+    
+    serializer, content_type, extension = EXPORT_FORMATS[export_format]
+    records = iter_goal_records(LearningGoal.objects.filter(user=request.user))
+    response = StreamingHttpResponse(serializer(records), content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="roadmaps.{extension}"'
+    return response
+
+
 @login_required
 def complete_milestone(request, milestone_id):
     """Mark a milestone as completed"""
     if request.method == 'POST':
-        milestone = get_object_or_404(Milestone, id=milestone_id)
+        milestone = get_object_or_404(Milestone, id=milestone_id, roadmap__goal__deleted_at__isnull=True)
         
         # Check if user owns this goal
         if milestone.roadmap.goal.user != request.user:
@@ -141,7 +191,16 @@ def complete_milestone(request, milestone_id):
             milestone.completed_at = timezone.now()
         else:
             milestone.completed_at = None
-        milestone.save()
+        with transaction.atomic():
+            # Flip only if the row still holds the value we read, so two
+            # overlapping toggles can't both apply their delta to the stats
+            flipped = Milestone.objects.filter(id=milestone.id, is_completed=not milestone.is_completed).update(
+                is_completed=milestone.is_completed, completed_at=milestone.completed_at
+            )
+            if flipped:
+                record_milestone_toggle(milestone, milestone.roadmap.goal)
+        if not flipped:
+            milestone.refresh_from_db(fields=['is_completed', 'completed_at'])
         
         # Update or create progress entry
         hours_spent = float(request.POST.get('hours_spent', 0))
@@ -171,7 +230,7 @@ def complete_milestone(request, milestone_id):
 def complete_resource(request, resource_id):
     """Mark a resource as completed"""
     if request.method == 'POST':
-        resource = get_object_or_404(Resource, id=resource_id)
+        resource = get_object_or_404(Resource, id=resource_id, milestone__roadmap__goal__deleted_at__isnull=True)
         
         # Check if user owns this goal
         if resource.milestone.roadmap.goal.user != request.user:
@@ -182,7 +241,16 @@ def complete_resource(request, resource_id):
             resource.completed_at = timezone.now()
         else:
             resource.completed_at = None
-        resource.save()
+        with transaction.atomic():
+            # Flip only if the row still holds the value we read, so two
+            # overlapping toggles can't both apply their delta to the stats
+            flipped = Resource.objects.filter(id=resource.id, is_completed=not resource.is_completed).update(
+                is_completed=resource.is_completed, completed_at=resource.completed_at
+            )
+            if flipped:
+                record_resource_toggle(resource, resource.milestone.roadmap.goal)
+        if not flipped:
+            resource.refresh_from_db(fields=['is_completed', 'completed_at'])
         
         return JsonResponse({
             'success': True,
@@ -192,12 +260,20 @@ def complete_resource(request, resource_id):
     return JsonResponse({'error': 'Invalid request'}, status=400)
 
 
+@staff_member_required
+def analytics(request):
+    """Completion stats per category and difficulty, read from the aggregate tables"""
+    return render(request, 'learning_roadmap/analytics.html', get_analytics())
+
+
 @login_required
 def delete_goal(request, goal_id):
     """Delete a learning goal"""
     if request.method == 'POST':
-        goal = get_object_or_404(LearningGoal, id=goal_id, user=request.user)
-        goal.delete()
+        goal = get_object_or_404(LearningGoal, id=goal_id, user=request.user, deleted_at__isnull=True)
+        # Tombstone now; the roadmap rows are purged in the background
+        goal.soft_delete()
+        schedule_purge()
         messages.success(request, 'Goal deleted successfully.')
     
     return redirect('dashboard')
\ No newline at end of file